@@ -10,6 +10,7 @@ This package contains:
 - scheduler: APScheduler-based auto backup
 - auth: Single admin authentication
 - audit: Dual audit logging (file + DB)
+- adapters_pool: Pooled device connections for adapters
 - encryption: AES-256 credential encryption
 - forms: WTForms for Web UI
 """
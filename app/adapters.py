@@ -10,16 +10,88 @@ CRITICAL RULES:
 - NO arbitrary command execution
 """
 
+import os
+import re
+import mmap
 import time
+import socket
+import subprocess
 import hashlib
-from abc import ABC, abstractmethod
-from datetime import datetime
-from typing import Tuple, Optional
-from netmiko import ConnectHandler
+import functools
+from abc import ABC
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import ClassVar, Tuple, Optional
 from netmiko.exceptions import NetmikoTimeoutException, NetmikoAuthenticationException
 
+try:
+    from inotify_simple import INotify, flags as inotify_flags
+    INOTIFY_AVAILABLE = True
+except ImportError:
+    INOTIFY_AVAILABLE = False
+
 from config import get_config
-from app.encryption import decrypt_credential
+from app.encryption import decrypt_credentials
+from app.adapters_pool import get_connection_pool
+
+# Configuration is static for the process lifetime - load it once
+_CONFIG = None
+
+
+def _cfg():
+    """Get cached configuration instance"""
+    global _CONFIG
+    _CONFIG = _CONFIG or get_config()
+    return _CONFIG
+
+
+@functools.lru_cache(maxsize=4096)
+def _decrypt_cached(ciphertexts: Tuple[str, ...]) -> Tuple[str, ...]:
+    """Decrypt a device's credentials once per ciphertext set (scheduled backups revisit the same devices)"""
+    return tuple(decrypt_credentials(ciphertexts))
+
+
+def clear_credential_cache():
+    """Drop cached plaintext credentials (call after credential edits or master key rotation)"""
+    _decrypt_cached.cache_clear()
+
+
+# Checksums must stay SHA-256: storage writes checksum.sha256 files and
+# BackupHistory.checksum_sha256 is verified against them
+_HASH_BLOCK_SIZE = 1 << 20
+
+
+def _sha256_text_hexdigest(text: str) -> str:
+    """
+    SHA-256 over UTF-8 encoded text without encoding it all at once.
+    
+    Encoding slice by slice yields the same bytes as text.encode(),
+    but only one block is materialized at a time.
+    """
+    sha256 = hashlib.sha256()
+    for offset in range(0, len(text), _HASH_BLOCK_SIZE):
+        sha256.update(text[offset:offset + _HASH_BLOCK_SIZE].encode('utf-8'))
+    return sha256.hexdigest()
+
+
+def _utc_timestamp() -> str:
+    """Current UTC time as ISO 8601 string (backup result timestamp)"""
+    return datetime.now(timezone.utc).isoformat()
+
+
+# SSH options shared by every SSH connection:
+# Disable strict host key checking and allow legacy algorithms.
+# Many network devices (Huawei, ZTE, older Cisco) use ssh-rsa which is
+# disabled by default in OpenSSH 8.8+ (Ubuntu 22.04+)
+_SSH_EXTRA_PARAMS = {
+    'allow_agent': False,
+    'use_keys': False,
+    # Don't use system SSH config which may block legacy algorithms
+    'ssh_config_file': None,
+    # Netmiko 4.x+ supports disabled_algorithms parameter
+    # Set to empty dict to allow all algorithms including legacy ssh-rsa
+    'disabled_algorithms': {'pubkeys': []},
+}
 
 
 class VendorAdapter(ABC):
@@ -43,36 +115,36 @@ class VendorAdapter(ABC):
                 - enable_password: Encrypted enable password (optional)
                 - connection_type: ssh or telnet
         """
-        self.config = get_config()
+        self.config = _cfg()
         self.device_info = device_info
         self.connection = None
+        self._pool_key = None
+        self._cached_params = None
         
-    @property
-    @abstractmethod
-    def vendor_name(self) -> str:
-        """Return vendor name"""
-        pass
-    
-    @property
-    @abstractmethod
-    def device_type(self) -> str:
-        """Return netmiko device type"""
-        pass
-    
-    @property
-    @abstractmethod
-    def backup_command(self) -> str:
-        """Return HARDCODED backup command"""
-        pass
-    
-    @property
-    @abstractmethod
-    def output_extension(self) -> str:
-        """Return output file extension"""
-        pass
+    __slots__ = ('config', 'device_info', 'connection', '_pool_key', '_cached_params')
+    
+    # Per-vendor constants (HARDCODED) - every concrete adapter must set these
+    vendor_name: ClassVar[str] = None       # Vendor name
+    device_type: ClassVar[str] = None       # Netmiko device type
+    backup_command: ClassVar[str] = None    # HARDCODED backup command
+    output_extension: ClassVar[str] = None  # Output file extension
+    
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        missing = [name for name in ('vendor_name', 'device_type', 'backup_command', 'output_extension')
+                   if getattr(cls, name) is None]
+        if missing:
+            raise TypeError(f"{cls.__name__} must define: {', '.join(missing)}")
     
     def _get_connection_params(self) -> dict:
-        """Build connection parameters for netmiko"""
+        """
+        Build connection parameters for netmiko.
+        
+        Built once per adapter instance (device_info doesn't change after init).
+        """
+        if self._cached_params is not None:
+            return self._cached_params
+        
         connection_type = self.device_info.get('connection_type', 'ssh')
         
         # Determine port
@@ -83,9 +155,13 @@ class VendorAdapter(ABC):
             else:
                 port = self.config.DEFAULT_SSH_PORT
         
-        # Decrypt credentials
-        username = decrypt_credential(self.device_info['username'])
-        password = decrypt_credential(self.device_info['password'])
+        # Decrypt credentials (username, password, enable password) in one batch
+        enable_password = self.device_info.get('enable_password')
+        username, password, secret = _decrypt_cached((
+            self.device_info['username'],
+            self.device_info['password'],
+            enable_password
+        ))
         
         params = {
             'device_type': self.device_type,
@@ -100,34 +176,30 @@ class VendorAdapter(ABC):
         if connection_type == 'telnet':
             params['device_type'] = f"{self.device_type}_telnet"
         else:
-            # SSH: Disable strict host key checking and allow legacy algorithms
-            # Many network devices (Huawei, ZTE, older Cisco) use ssh-rsa which is 
-            # disabled by default in OpenSSH 8.8+ (Ubuntu 22.04+)
-            params['allow_agent'] = False
-            params['use_keys'] = False
-            # Don't use system SSH config which may block legacy algorithms
-            params['ssh_config_file'] = None
-            # Netmiko 4.x+ supports disabled_algorithms parameter
-            # Set to empty dict to allow all algorithms including legacy ssh-rsa
-            params['disabled_algorithms'] = {'pubkeys': []}
+            params.update(_SSH_EXTRA_PARAMS)
         
         # Add enable password if available
-        enable_password = self.device_info.get('enable_password')
         if enable_password:
-            params['secret'] = decrypt_credential(enable_password)
+            params['secret'] = secret
         
+        self._cached_params = params
         return params
     
     def connect(self) -> bool:
         """
         Establish connection to device.
         
+        Reuses an idle pooled session for the same device and credentials
+        when one is available.
+        
         Returns:
             True if connection successful, False otherwise
         """
         try:
             params = self._get_connection_params()
-            self.connection = ConnectHandler(**params)
+            pool = get_connection_pool()
+            self._pool_key = pool.make_key(params)
+            self.connection = pool.acquire(self._pool_key, params)
             return True
         except NetmikoAuthenticationException:
             raise ConnectionError(f"Authentication failed for {self.device_info['ip_address']}")
@@ -136,11 +208,19 @@ class VendorAdapter(ABC):
         except Exception as e:
             raise ConnectionError(f"Connection failed: {str(e)}")
     
-    def disconnect(self):
-        """Disconnect from device"""
+    def disconnect(self, discard: bool = False):
+        """
+        Release connection back to the pool.
+        
+        Args:
+            discard: Close the session instead of pooling it (e.g. after an error)
+        """
         if self.connection:
             try:
-                self.connection.disconnect()
+                if discard:
+                    get_connection_pool().discard(self.connection)
+                else:
+                    get_connection_pool().release(self._pool_key, self.connection)
             except:
                 pass
             finally:
@@ -159,7 +239,7 @@ class VendorAdapter(ABC):
         if not self.connection:
             raise RuntimeError("Not connected to device")
         
-        start_time = time.time()
+        start_ns = time.monotonic_ns()
         
         # Execute HARDCODED backup command
         output = self.connection.send_command(
@@ -167,7 +247,7 @@ class VendorAdapter(ABC):
             read_timeout=self.config.COMMAND_TIMEOUT
         )
         
-        execution_time = time.time() - start_time
+        execution_time = (time.monotonic_ns() - start_ns) / 1e9
         
         return output, execution_time
     
@@ -189,7 +269,7 @@ class VendorAdapter(ABC):
             'execution_time': 0,
             'checksum': None,
             'error': None,
-            'timestamp': datetime.utcnow().isoformat()
+            'timestamp': _utc_timestamp()
         }
         
         try:
@@ -200,7 +280,7 @@ class VendorAdapter(ABC):
             output, exec_time = self.execute_backup()
             
             # Calculate checksum
-            checksum = hashlib.sha256(output.encode()).hexdigest()
+            checksum = _sha256_text_hexdigest(output)
             
             result['success'] = True
             result['output'] = output
@@ -209,6 +289,8 @@ class VendorAdapter(ABC):
             
         except Exception as e:
             result['error'] = str(e)
+            # Session state is unknown after a failure - don't pool it
+            self.disconnect(discard=True)
             
         finally:
             self.disconnect()
@@ -225,21 +307,12 @@ class MikroTikAdapter(VendorAdapter):
     Output: .rsc
     """
     
-    @property
-    def vendor_name(self) -> str:
-        return 'mikrotik'
+    __slots__ = ()
     
-    @property
-    def device_type(self) -> str:
-        return 'mikrotik_routeros'
-    
-    @property
-    def backup_command(self) -> str:
-        return '/export'
-    
-    @property
-    def output_extension(self) -> str:
-        return '.rsc'
+    vendor_name = 'mikrotik'
+    device_type = 'mikrotik_routeros'
+    backup_command = '/export'
+    output_extension = '.rsc'
 
 
 class CiscoAdapter(VendorAdapter):
@@ -251,29 +324,24 @@ class CiscoAdapter(VendorAdapter):
     Output: .txt
     """
     
-    @property
-    def vendor_name(self) -> str:
-        return 'cisco'
-    
-    @property
-    def device_type(self) -> str:
-        return 'cisco_ios'
-    
-    @property
-    def backup_command(self) -> str:
-        return 'show running-config'
+    __slots__ = ()
     
-    @property
-    def output_extension(self) -> str:
-        return '.txt'
+    vendor_name = 'cisco'
+    device_type = 'cisco_ios'
+    backup_command = 'show running-config'
+    output_extension = '.txt'
     
     def connect(self) -> bool:
         """Connect and enter enable mode if needed"""
         result = super().connect()
         
         # Enter enable mode if enable password is provided
+        # (pooled sessions may already be in enable mode from a prior backup)
         if self.device_info.get('enable_password'):
-            self.connection.enable()
+            pool = get_connection_pool()
+            if not pool.in_enable_mode(self.connection):
+                self.connection.enable()
+                pool.mark_enable_mode(self.connection)
         
         return result
 
@@ -287,21 +355,61 @@ class HuaweiAdapter(VendorAdapter):
     Output: .txt
     """
     
-    @property
-    def vendor_name(self) -> str:
-        return 'huawei'
+    __slots__ = ()
     
-    @property
-    def device_type(self) -> str:
-        return 'huawei'
+    vendor_name = 'huawei'
+    device_type = 'huawei'
+    backup_command = 'display current-configuration'
+    output_extension = '.txt'
+
+
+_LOCAL_HOST_IP = None
+
+
+def _local_host_ip() -> str:
+    """
+    IP of this host's own hostname, resolved once.
     
-    @property
-    def backup_command(self) -> str:
-        return 'display current-configuration'
+    gethostbyname() can block for seconds on a slow resolver; a failed
+    lookup is not cached so it raises (and is retried) like before.
+    """
+    global _LOCAL_HOST_IP
+    if _LOCAL_HOST_IP is None:
+        _LOCAL_HOST_IP = socket.gethostbyname(socket.gethostname())
+    return _LOCAL_HOST_IP
+
+
+# Local IP used to reach each device (route lookups only; fallbacks are not cached)
+_SERVER_IP_CACHE = {}
+_SERVER_IP_CACHE_MAX = 256
+
+
+def _resolve_server_ip(device_ip: str) -> str:
+    """
+    Get the local IP used to reach device_ip.
     
-    @property
-    def output_extension(self) -> str:
-        return '.txt'
+    Routing doesn't change within a process lifetime, so a successful
+    lookup is cached per device (avoids a socket per backup). If it fails,
+    the hostname IP is returned uncached and the route is tried again
+    on the next backup.
+    """
+    server_ip = _SERVER_IP_CACHE.get(device_ip)
+    if server_ip is not None:
+        return server_ip
+    
+    try:
+        s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        s.connect((device_ip, 80))
+        server_ip = s.getsockname()[0]
+        s.close()
+    except:
+        # Fallback to hostname IP
+        return _local_host_ip()
+    
+    if len(_SERVER_IP_CACHE) >= _SERVER_IP_CACHE_MAX:
+        _SERVER_IP_CACHE.clear()
+    _SERVER_IP_CACHE[device_ip] = server_ip
+    return server_ip
 
 
 class ZTEAdapter(VendorAdapter):
@@ -321,30 +429,60 @@ class ZTEAdapter(VendorAdapter):
     Output: startrun.dat (binary config file)
     """
     
+    __slots__ = ('_ftp_config_cache',)
+    
     # FTP polling settings
     FTP_POLL_TIMEOUT = 120  # Maximum wait time in seconds
     FTP_POLL_INTERVAL = 3   # Poll every 3 seconds
+    FTP_CONFIG_TTL = 10     # Re-check FTP service status after 10 seconds
+    FTP_STATUS_FILE = '/var/lib/leuitcss/ftp-server.status'  # Written by ftp-server.py
     
-    @property
-    def vendor_name(self) -> str:
-        return 'zte'
-    
-    @property
-    def device_type(self) -> str:
-        return 'zte_zxros'
+    # CLI prompt after the upload command (compiled once, netmiko accepts patterns)
+    _PROMPT_RE = re.compile(r'#|>|\$')
     
-    @property
-    def backup_command(self) -> str:
-        # This is a template - actual command built in _build_ftp_upload_command
-        return 'file upload cfg-startup startrun.dat ftp'
+    vendor_name = 'zte'
+    device_type = 'zte_zxros'
+    # This is a template - actual command built in _build_ftp_upload_command
+    backup_command = 'file upload cfg-startup startrun.dat ftp'
+    output_extension = '.dat'
     
-    @property
-    def output_extension(self) -> str:
-        return '.dat'
+    def __init__(self, device_info: dict):
+        super().__init__(device_info)
+        self._ftp_config_cache = None  # (expiry, ftp_config)
     
     def _is_ftp_service_running(self) -> bool:
-        """Check if FTP service is running via systemd"""
-        import subprocess
+        """
+        Check if FTP service is running.
+        
+        Reads the status file written by ftp-server.py and probes its PID
+        (no fork). Falls back to systemd when the status file is missing
+        or unreadable.
+        """
+        try:
+            status = {}
+            with open(self.FTP_STATUS_FILE, 'r') as f:
+                for line in f:
+                    key, _, value = line.strip().partition('=')
+                    status[key] = value
+        except OSError:
+            status = None  # Missing or unreadable status file - ask systemd
+        except ValueError:
+            return False  # Malformed (undecodable) status file
+        
+        if status is not None:
+            if status.get('status') != 'running':
+                return False
+            
+            try:
+                os.kill(int(status['pid']), 0)
+                return True
+            except PermissionError:
+                return True  # Process exists but belongs to another user
+            except (ProcessLookupError, KeyError, ValueError):
+                return False  # Stale or malformed status file
+            except OSError:
+                pass  # PID could not be probed - ask systemd
+        
         try:
             result = subprocess.run(
                 ['systemctl', 'is-active', 'leuitcss-ftp'],
@@ -355,19 +493,31 @@ class ZTEAdapter(VendorAdapter):
             return False
     
     def _get_ftp_config(self) -> dict:
-        """Get FTP configuration from environment and check service status"""
-        import os
+        """
+        Get FTP configuration from environment and check service status.
+        
+        Result is cached for FTP_CONFIG_TTL seconds so a single backup
+        doesn't fork systemctl more than once.
+        """
+        cached = self._ftp_config_cache
+        if cached and time.monotonic() < cached[0]:
+            return cached[1]
         
         # Check if FTP service is actually running (not just env variable)
         ftp_running = self._is_ftp_service_running()
         
-        return {
+        ftp_config = {
             'enabled': ftp_running,  # Use actual service status
             'port': int(os.environ.get('LEUITCSS_FTP_PORT', '21')),
             'user': os.environ.get('LEUITCSS_FTP_USER', 'leuitcss'),
             'password': os.environ.get('LEUITCSS_FTP_PASSWORD', ''),
             'root': os.environ.get('LEUITCSS_FTP_ROOT', '/var/lib/leuitcss/ftp-ingestion')
         }
+        # Credential part of the upload command only changes with the environment
+        ftp_config['command_tail'] = f"user {ftp_config['user']} password {ftp_config['password']}"
+        
+        self._ftp_config_cache = (time.monotonic() + self.FTP_CONFIG_TTL, ftp_config)
+        return ftp_config
     
     def _get_server_ip(self) -> str:
         """
@@ -377,34 +527,22 @@ class ZTEAdapter(VendorAdapter):
         1. LEUITCSS_SERVER_IP from environment (manual override)
         2. Auto-detect based on route to device
         """
-        import os
-        import socket
-        
         # Check for manual override first
         manual_ip = os.environ.get('LEUITCSS_SERVER_IP', '').strip()
         if manual_ip:
             return manual_ip
         
         # Auto-detect: Get the IP that would be used to connect to the device
-        try:
-            s = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
-            s.connect((self.device_info['ip_address'], 80))
-            server_ip = s.getsockname()[0]
-            s.close()
-            return server_ip
-        except:
-            # Fallback to hostname IP
-            return socket.gethostbyname(socket.gethostname())
+        return _resolve_server_ip(self.device_info['ip_address'])
     
-    def _get_ftp_inbox_path(self, device_id: int) -> str:
+    def _get_ftp_inbox_path(self, device_id: int, ftp_config: dict = None) -> str:
         """Get FTP inbox path for this device"""
-        from pathlib import Path
-        ftp_config = self._get_ftp_config()
+        ftp_config = ftp_config or self._get_ftp_config()
         inbox_path = Path(ftp_config['root']) / 'zte' / str(device_id)
         inbox_path.mkdir(parents=True, exist_ok=True)
         return str(inbox_path)
     
-    def _build_ftp_upload_command(self, device_id: int) -> str:
+    def _build_ftp_upload_command(self, device_id: int, ftp_config: dict = None) -> str:
         """
         Build the HARDCODED FTP upload command for ZTE OLT.
         
@@ -413,7 +551,7 @@ class ZTEAdapter(VendorAdapter):
         
         Note: path is RELATIVE to FTP root, not absolute path
         """
-        ftp_config = self._get_ftp_config()
+        ftp_config = ftp_config or self._get_ftp_config()
         server_ip = self._get_server_ip()
         
         # Path RELATIVE to FTP root (not absolute)
@@ -422,21 +560,13 @@ class ZTEAdapter(VendorAdapter):
         ftp_path = f"zte/{device_id}/"
         
         # HARDCODED command - cannot be modified from UI
-        command = (
-            f"file upload cfg-startup startrun.dat ftp "
-            f"ipaddress {server_ip} "
-            f"path {ftp_path} "
-            f"user {ftp_config['user']} "
-            f"password {ftp_config['password']}"
-        )
+        # (backup_command is the fixed prefix, credentials tail is prebuilt)
+        command = f"{self.backup_command} ipaddress {server_ip} path {ftp_path} {ftp_config['command_tail']}"
         
         return command
     
     def _clear_inbox(self, inbox_path: str):
         """Clear any existing files in inbox before backup"""
-        from pathlib import Path
-        import os
-        
         inbox = Path(inbox_path)
         # Clear startrun.dat if exists
         target_file = inbox / 'startrun.dat'
@@ -448,19 +578,53 @@ class ZTEAdapter(VendorAdapter):
     
     def _poll_for_file(self, inbox_path: str) -> Optional[str]:
         """
-        Poll FTP inbox for incoming file.
+        Wait for incoming file in FTP inbox.
+        
+        Uses inotify (IN_CLOSE_WRITE) when available so we return as soon
+        as the FTP server finishes writing. Falls back to stat() polling.
         
         Returns:
             Path to received file, or None if timeout
         """
-        from pathlib import Path
+        if INOTIFY_AVAILABLE:
+            try:
+                return self._wait_for_file_inotify(inbox_path)
+            except OSError:
+                pass  # inotify watch limit reached etc. - fall back to polling
         
+        return self._poll_for_file_stat(inbox_path)
+    
+    def _wait_for_file_inotify(self, inbox_path: str) -> Optional[str]:
+        """Block on inotify until startrun.dat is closed after writing"""
+        target_file = Path(inbox_path) / 'startrun.dat'
+        deadline = time.monotonic() + self.FTP_POLL_TIMEOUT
+        
+        with INotify() as inotify:
+            inotify.add_watch(inbox_path, inotify_flags.CLOSE_WRITE | inotify_flags.MOVED_TO)
+            
+            # File may have landed before the watch was added
+            if target_file.exists():
+                time.sleep(1)
+                if target_file.stat().st_size > 0:
+                    return str(target_file)
+            
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return None
+                
+                for event in inotify.read(timeout=int(remaining * 1000)):
+                    if event.name == 'startrun.dat' and target_file.stat().st_size > 0:
+                        return str(target_file)
+    
+    def _poll_for_file_stat(self, inbox_path: str) -> Optional[str]:
+        """Poll FTP inbox with stat() until file arrives"""
         inbox = Path(inbox_path)
         target_file = inbox / 'startrun.dat'
         
-        start_time = time.time()
+        start_time = time.monotonic()
         
-        while (time.time() - start_time) < self.FTP_POLL_TIMEOUT:
+        while (time.monotonic() - start_time) < self.FTP_POLL_TIMEOUT:
             # Check if file exists and has content
             if target_file.exists():
                 # Wait a moment for file to finish writing
@@ -474,6 +638,78 @@ class ZTEAdapter(VendorAdapter):
         
         return None
     
+    def _new_result(self) -> dict:
+        """Empty ZTE backup result"""
+        return {
+            'success': False,
+            'output': None,
+            'execution_time': 0,
+            'checksum': None,
+            'error': None,
+            'timestamp': _utc_timestamp(),
+            'file_path': None  # For ZTE, we store the file path
+        }
+    
+    def _prepare_inbox(self, device_id: int) -> Tuple[dict, str]:
+        """
+        Check FTP prerequisites and clear the device inbox.
+        
+        Returns:
+            Tuple of (ftp_config, inbox_path)
+        """
+        # Check FTP is enabled
+        ftp_config = self._get_ftp_config()
+        if not ftp_config['enabled']:
+            raise RuntimeError("FTP server is not enabled. Enable it in Web UI (ZTE FTP Ingestion)")
+        
+        if not ftp_config['password']:
+            raise RuntimeError("FTP password not configured in .env file")
+        
+        # Get inbox path and clear it
+        inbox_path = self._get_ftp_inbox_path(device_id, ftp_config)
+        self._clear_inbox(inbox_path)
+        
+        return ftp_config, inbox_path
+    
+    def _send_upload_command(self, device_id: int, ftp_config: dict):
+        """SSH to device and trigger the FTP upload"""
+        # Connect to device
+        self.connect()
+        
+        # Build and execute FTP upload command
+        upload_command = self._build_ftp_upload_command(device_id, ftp_config)
+        
+        # Send command (don't wait for output, ZTE uploads in background)
+        self.connection.send_command(
+            upload_command,
+            read_timeout=30,
+            expect_string=self._PROMPT_RE  # Return after prompt
+        )
+        
+        # Disconnect SSH - we're done with the device
+        self.disconnect()
+    
+    def _complete_result(self, result: dict, received_file: Optional[str], start_ns: int):
+        """
+        Hash the received file into result.
+        
+        The bytes are not loaded: output stays None and file_path points at
+        startrun.dat, which the collector copies with save_backup_stream.
+        """
+        if not received_file:
+            raise RuntimeError(f"FTP file not received within {self.FTP_POLL_TIMEOUT} seconds")
+        
+        # startrun.dat is binary: hash it via mmap (page cache, no bytes copy)
+        with open(received_file, 'rb') as f:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                checksum = hashlib.sha256(mapped).hexdigest()
+        
+        # Success
+        result['success'] = True
+        result['execution_time'] = (time.monotonic_ns() - start_ns) / 1e9
+        result['checksum'] = checksum
+        result['file_path'] = received_file
+    
     def backup(self) -> dict:
         """
         Perform ZTE OLT backup via FTP.
@@ -484,71 +720,23 @@ class ZTEAdapter(VendorAdapter):
         Returns:
             Dict containing backup result
         """
-        result = {
-            'success': False,
-            'output': None,
-            'execution_time': 0,
-            'checksum': None,
-            'error': None,
-            'timestamp': datetime.utcnow().isoformat(),
-            'file_path': None  # For ZTE, we store the file path
-        }
-        
-        start_time = time.time()
+        result = self._new_result()
+        start_ns = time.monotonic_ns()
         device_id = self.device_info.get('device_id', 0)
         
         try:
-            # Check FTP is enabled
-            ftp_config = self._get_ftp_config()
-            if not ftp_config['enabled']:
-                raise RuntimeError("FTP server is not enabled. Enable it in Web UI (ZTE FTP Ingestion)")
-            
-            if not ftp_config['password']:
-                raise RuntimeError("FTP password not configured in .env file")
-            
-            # Get inbox path and clear it
-            inbox_path = self._get_ftp_inbox_path(device_id)
-            self._clear_inbox(inbox_path)
-            
-            # Connect to device
-            self.connect()
-            
-            # Build and execute FTP upload command
-            upload_command = self._build_ftp_upload_command(device_id)
-            
-            # Send command (don't wait for output, ZTE uploads in background)
-            self.connection.send_command(
-                upload_command,
-                read_timeout=30,
-                expect_string=r'#|>|\$'  # Return after prompt
-            )
-            
-            # Disconnect SSH - we're done with the device
-            self.disconnect()
+            ftp_config, inbox_path = self._prepare_inbox(device_id)
+            self._send_upload_command(device_id, ftp_config)
             
             # Poll for incoming file
             received_file = self._poll_for_file(inbox_path)
             
-            if not received_file:
-                raise RuntimeError(f"FTP file not received within {self.FTP_POLL_TIMEOUT} seconds")
-            
-            # Read file content
-            with open(received_file, 'rb') as f:
-                content = f.read()
-            
-            # Calculate checksum
-            checksum = hashlib.sha256(content).hexdigest()
-            
-            # Success
-            result['success'] = True
-            result['output'] = content.decode('utf-8', errors='replace')
-            result['execution_time'] = time.time() - start_time
-            result['checksum'] = checksum
-            result['file_path'] = received_file
+            self._complete_result(result, received_file, start_ns)
             
         except Exception as e:
             result['error'] = str(e)
-            result['execution_time'] = time.time() - start_time
+            result['execution_time'] = (time.monotonic_ns() - start_ns) / 1e9
+            self.disconnect(discard=True)
             
         finally:
             self.disconnect()
@@ -565,21 +753,12 @@ class JuniperAdapter(VendorAdapter):
     Output: .txt
     """
     
-    @property
-    def vendor_name(self) -> str:
-        return 'juniper'
-    
-    @property
-    def device_type(self) -> str:
-        return 'juniper_junos'
-    
-    @property
-    def backup_command(self) -> str:
-        return 'show configuration | display set'
+    __slots__ = ()
     
-    @property
-    def output_extension(self) -> str:
-        return '.txt'
+    vendor_name = 'juniper'
+    device_type = 'juniper_junos'
+    backup_command = 'show configuration | display set'
+    output_extension = '.txt'
 
 
 class GenericAdapter(VendorAdapter):
@@ -599,21 +778,12 @@ class GenericAdapter(VendorAdapter):
     Note: Uses cisco_ios device type for Cisco-like CLI compatibility.
     """
     
-    @property
-    def vendor_name(self) -> str:
-        return 'generic'
-    
-    @property
-    def device_type(self) -> str:
-        return 'cisco_ios'  # Cisco-like CLI compatibility
-    
-    @property
-    def backup_command(self) -> str:
-        return 'show running-config'
+    __slots__ = ()
     
-    @property
-    def output_extension(self) -> str:
-        return '.txt'
+    vendor_name = 'generic'
+    device_type = 'cisco_ios'  # Cisco-like CLI compatibility
+    backup_command = 'show running-config'
+    output_extension = '.txt'
 
 
 class GenericSavedAdapter(VendorAdapter):
@@ -627,21 +797,12 @@ class GenericSavedAdapter(VendorAdapter):
     Use for devices that store config separately from running config.
     """
     
-    @property
-    def vendor_name(self) -> str:
-        return 'generic-saved'
+    __slots__ = ()
     
-    @property
-    def device_type(self) -> str:
-        return 'cisco_ios'
-    
-    @property
-    def backup_command(self) -> str:
-        return 'show saved-config'
-    
-    @property
-    def output_extension(self) -> str:
-        return '.txt'
+    vendor_name = 'generic-saved'
+    device_type = 'cisco_ios'
+    backup_command = 'show saved-config'
+    output_extension = '.txt'
 
 
 class GenericStartupAdapter(VendorAdapter):
@@ -655,21 +816,12 @@ class GenericStartupAdapter(VendorAdapter):
     Use for devices that use startup-config (config loaded at boot).
     """
     
-    @property
-    def vendor_name(self) -> str:
-        return 'generic-startup'
-    
-    @property
-    def device_type(self) -> str:
-        return 'cisco_ios'
-    
-    @property
-    def backup_command(self) -> str:
-        return 'show startup-config'
+    __slots__ = ()
     
-    @property
-    def output_extension(self) -> str:
-        return '.txt'
+    vendor_name = 'generic-startup'
+    device_type = 'cisco_ios'
+    backup_command = 'show startup-config'
+    output_extension = '.txt'
 
 
 # Vendor adapter registry
@@ -699,9 +851,9 @@ def get_adapter(vendor: str, device_info: dict) -> VendorAdapter:
     Raises:
         ValueError: If vendor is not supported
     """
-    vendor = vendor.lower()
+    adapter_class = VENDOR_ADAPTERS.get(vendor) or VENDOR_ADAPTERS.get(vendor.lower())
     
-    if vendor not in VENDOR_ADAPTERS:
-        raise ValueError(f"Unsupported vendor: {vendor}. Supported: {list(VENDOR_ADAPTERS.keys())}")
+    if adapter_class is None:
+        raise ValueError(f"Unsupported vendor: {vendor.lower()}. Supported: {list(VENDOR_ADAPTERS.keys())}")
     
-    return VENDOR_ADAPTERS[vendor](device_info)
+    return adapter_class(device_info)
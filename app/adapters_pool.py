@@ -0,0 +1,180 @@
+"""
+LeuitCSS v1.0.0 - Connection Pool
+Process-wide cache of live device sessions for vendor adapters
+
+Pool Rules:
+- Sessions are keyed by (ip, port, username, device_type, credential fingerprint)
+- Username and an HMAC of password + enable secret are part of the key
+  (no credential crossover, edited credentials never reuse old sessions)
+- Idle sessions are evicted after CONNECTION_POOL_IDLE_TIMEOUT
+- Sessions are health-checked before reuse
+"""
+
+import os
+import hmac
+import time
+import hashlib
+import logging
+import threading
+import weakref
+from collections import deque
+from typing import Dict, Tuple
+
+from netmiko import ConnectHandler
+
+from config import get_config
+
+logger = logging.getLogger('leuitcss.adapters')
+
+# Per-process HMAC key: fingerprints are only compared within this process
+_FINGERPRINT_KEY = os.urandom(32)
+
+
+class ConnectionPool:
+    """
+    Thread-safe pool of netmiko connections.
+    
+    acquire() hands out an idle session for the key (or opens a new one),
+    release() returns it to the pool. A background reaper disconnects
+    sessions that have been idle longer than the configured timeout.
+    """
+    
+    def __init__(self, idle_timeout: int = None):
+        self.config = get_config()
+        self.idle_timeout = idle_timeout or self.config.CONNECTION_POOL_IDLE_TIMEOUT
+        self._idle: Dict[Tuple, deque] = {}
+        self._enable_mode = weakref.WeakSet()  # Sessions already in privileged mode
+        self._lock = threading.Lock()
+        self._reaper = None
+    
+    @staticmethod
+    def make_key(params: dict) -> Tuple:
+        """Build pool key from netmiko connection parameters (secrets only as an HMAC)"""
+        secrets = f"{params.get('password') or ''}\0{params.get('secret') or ''}"
+        fingerprint = hmac.new(_FINGERPRINT_KEY, secrets.encode(), hashlib.sha256).hexdigest()
+        return (params['host'], params['port'], params['username'], params['device_type'], fingerprint)
+    
+    def acquire(self, key: Tuple, params: dict):
+        """
+        Get a live connection for key, opening a new one if needed.
+        
+        Raises the underlying netmiko exception if a new connection fails.
+        """
+        while True:
+            with self._lock:
+                entries = self._idle.get(key)
+                if not entries:
+                    break
+                conn, _ = entries.pop()
+            
+            # Health check outside the lock (may hit the network)
+            if self._is_alive(conn):
+                return conn
+            self._close(conn)
+        
+        return ConnectHandler(**params)
+    
+    def release(self, key: Tuple, conn):
+        """Return a connection to the pool for later reuse"""
+        if conn is None:
+            return
+        
+        with self._lock:
+            self._idle.setdefault(key, deque()).append((conn, time.monotonic()))
+            self._schedule_reaper()
+    
+    def in_enable_mode(self, conn) -> bool:
+        """Check if a (possibly reused) session was already put in enable mode"""
+        with self._lock:
+            return conn in self._enable_mode
+    
+    def mark_enable_mode(self, conn):
+        """Remember that a session is in enable mode so the next borrower can skip it"""
+        with self._lock:
+            self._enable_mode.add(conn)
+    
+    def discard(self, conn):
+        """Close a connection that must not be reused (e.g. after an error)"""
+        self._close(conn)
+    
+    def discard_host(self, host: str):
+        """Disconnect idle sessions to host (after its device is edited or deleted)"""
+        with self._lock:
+            keys = [key for key in self._idle if key[0] == host]
+            entries = [conn for key in keys for conn, _ in self._idle.pop(key)]
+        
+        for conn in entries:
+            self._close(conn)
+    
+    def close_all(self):
+        """Disconnect all idle connections"""
+        with self._lock:
+            entries = [conn for queue in self._idle.values() for conn, _ in queue]
+            self._idle.clear()
+            if self._reaper:
+                self._reaper.cancel()
+                self._reaper = None
+        
+        for conn in entries:
+            self._close(conn)
+    
+    def _schedule_reaper(self):
+        """Start the idle reaper timer (caller must hold the lock)"""
+        if self._reaper is not None:
+            return
+        
+        self._reaper = threading.Timer(self.idle_timeout, self._reap)
+        self._reaper.daemon = True
+        self._reaper.start()
+    
+    def _reap(self):
+        """Disconnect connections idle longer than idle_timeout"""
+        now = time.monotonic()
+        expired = []
+        
+        with self._lock:
+            self._reaper = None
+            for key in list(self._idle):
+                queue = self._idle[key]
+                while queue and now - queue[0][1] >= self.idle_timeout:
+                    expired.append(queue.popleft()[0])
+                if not queue:
+                    del self._idle[key]
+            
+            if self._idle:
+                self._schedule_reaper()
+        
+        for conn in expired:
+            self._close(conn)
+        
+        if expired:
+            logger.debug(f"Connection pool evicted {len(expired)} idle session(s)")
+    
+    @staticmethod
+    def _is_alive(conn) -> bool:
+        try:
+            return conn.is_alive()
+        except Exception:
+            return False
+    
+    @staticmethod
+    def _close(conn):
+        try:
+            conn.disconnect()
+        except:
+            pass
+
+
+# Singleton instance
+_pool_instance = None
+_pool_lock = threading.Lock()
+
+
+def get_connection_pool() -> ConnectionPool:
+    """Get singleton connection pool instance"""
+    global _pool_instance
+    if _pool_instance is None:
+        with _pool_lock:
+            if _pool_instance is None:
+                _pool_instance = ConnectionPool()
+    return _pool_instance
@@ -10,14 +10,87 @@ Security Rules:
 
 import os
 import json
+import time
+import atexit
 import logging
+import threading
+import queue
+from collections import deque
 from datetime import datetime
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
-from flask import request, has_request_context
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
+from flask import g, request, has_request_context
 
 from config import get_config
 
+# Optional fast JSON encoder (falls back to stdlib json)
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+
+_now = datetime.utcnow
+
+
+def _json_dumps(obj) -> str:
+    """Serialize audit payload to JSON text"""
+    if ORJSON_AVAILABLE:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_NON_STR_KEYS).decode('utf-8')
+    return json.dumps(obj, default=str)
+
+
+class _BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    Rotating file handler with a large write buffer.
+    
+    File size is tracked arithmetically instead of probing the stream on
+    every emit. Only WARNING and above force a flush; routine INFO entries
+    reach disk within FLUSH_INTERVAL seconds.
+    """
+    BUFFER_SIZE = 64 * 1024
+    FLUSH_INTERVAL = 1.0
+    
+    def __init__(self, *args, **kwargs):
+        self._size = 0
+        self._flush_timer = None
+        super().__init__(*args, **kwargs)
+    
+    def _open(self):
+        stream = open(self.baseFilename, self.mode, buffering=self.BUFFER_SIZE,
+                      encoding=self.encoding, errors=self.errors)
+        self._size = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def emit(self, record):
+        try:
+            msg = self.format(record) + self.terminator
+            if self.stream is None:
+                self.stream = self._open()
+            # maxBytes is in bytes: count the encoded length, not characters
+            msg_size = len(msg.encode(self.stream.encoding, self.stream.errors))
+            if self.maxBytes > 0 and self._size > 0 and self._size + msg_size >= self.maxBytes:
+                self.doRollover()
+            self.stream.write(msg)
+            self._size += msg_size
+            
+            if record.levelno >= logging.WARNING:
+                self.flush()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.FLUSH_INTERVAL, self._timed_flush)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+        except RecursionError:
+            raise
+        except Exception:
+            self.handleError(record)
+    
+    def _timed_flush(self):
+        with self.lock:
+            self._flush_timer = None
+            self.flush()
+
 
 class AuditLogger:
     """
@@ -29,18 +102,49 @@ class AuditLogger:
         self.config = get_config()
         self.db_session = db_session
         self._file_logger = None
+        self._listener = None
         self._setup_file_logger()
         
+        # DB entries are batched and written in one transaction per flush
+        self._pending = deque()
+        self._pending_lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        self._flush_timer = None
+        self._checked_binds = set()
+        atexit.register(self.flush)
+        
         if app:
             self.init_app(app)
     
     def init_app(self, app):
         """Initialize with Flask app"""
         self.app = app
+        # Write out the request's audit entries at teardown. Teardown functions
+        # run in reverse registration order, so call this after the session
+        # teardown is registered: the flush then runs while the session is open.
+        app.teardown_request(lambda exception=None: self.flush_request())
     
     def set_db_session(self, db_session):
         """Set database session for DB logging"""
         self.db_session = db_session
+        if db_session is not None:
+            self._check_journal_mode(db_session)
+    
+    def _check_journal_mode(self, db_session):
+        """Warn once per engine if SQLite is not in WAL mode (see models.configure_sqlite)"""
+        from sqlalchemy import text
+        
+        bind = db_session.get_bind()
+        if bind in self._checked_binds or bind.dialect.name != 'sqlite':
+            return
+        self._checked_binds.add(bind)
+        
+        try:
+            mode = db_session.execute(text('PRAGMA journal_mode')).scalar()
+            if str(mode).lower() != 'wal':
+                self._file_logger.warning(f"SQLite journal_mode is '{mode}', expected 'wal'")
+        except Exception as e:
+            self._file_logger.warning(f"Could not check SQLite journal_mode: {e}")
     
     def _setup_file_logger(self):
         """Setup file-based audit logging"""
@@ -54,10 +158,10 @@ class AuditLogger:
         
         # Prevent duplicate handlers
         if not self._file_logger.handlers:
-            # Rotating file handler (10MB max, keep 10 backups)
-            file_handler = RotatingFileHandler(
+            # Buffered rotating file handler (64MB max, keep 10 backups)
+            file_handler = _BufferedRotatingFileHandler(
                 audit_log_file,
-                maxBytes=10*1024*1024,
+                maxBytes=64*1024*1024,
                 backupCount=10,
                 encoding='utf-8'
             )
@@ -67,23 +171,32 @@ class AuditLogger:
                 datefmt='%Y-%m-%d %H:%M:%S'
             )
             file_handler.setFormatter(formatter)
-            self._file_logger.addHandler(file_handler)
+            file_handler.setLevel(logging.INFO)
+            
+            # Callers only enqueue; a single listener thread does the disk I/O
+            log_queue = queue.Queue(-1)
+            self._file_logger.addHandler(QueueHandler(log_queue))
+            self._listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+            self._listener.start()
+            atexit.register(self._listener.stop)
     
-    def _get_request_info(self):
-        """Extract request information if in request context"""
-        if has_request_context():
-            return {
-                'ip_address': request.remote_addr,
-                'user_agent': request.user_agent.string[:255] if request.user_agent else None
-            }
-        return {'ip_address': None, 'user_agent': None}
+    def _get_request_info(self) -> tuple:
+        """Extract (ip_address, user_agent) if in request context, cached per request"""
+        if not has_request_context():
+            return None, None
+        
+        info = g.get('_audit_req_info')
+        if info is None:
+            # Raw header from the WSGI environ, skips Werkzeug's User-Agent parser
+            user_agent = request.environ.get('HTTP_USER_AGENT')
+            info = (request.remote_addr, user_agent[:255] if user_agent else None)
+            g._audit_req_info = info
+        return info
     
     def _log_to_file(self, action: str, actor_type: str, actor_id: str, 
                      resource_type: str, resource_id: str, details: dict,
-                     success: bool, error_message: str):
+                     success: bool, error_message: str, ip_address: str = None):
         """Write log entry to file"""
-        request_info = self._get_request_info()
-        
         log_entry = {
             'action': action,
             'actor_type': actor_type,
@@ -93,50 +206,100 @@ class AuditLogger:
             'details': details,
             'success': success,
             'error_message': error_message,
-            'ip_address': request_info['ip_address']
+            'ip_address': ip_address
         }
         
         level = logging.INFO if success else logging.WARNING
-        self._file_logger.log(level, json.dumps(log_entry, default=str))
+        self._file_logger.log(level, _json_dumps(log_entry))
     
     def _log_to_db(self, action: str, actor_type: str, actor_id: str,
-                   resource_type: str, resource_id: str, details: dict,
-                   success: bool, error_message: str):
-        """Write log entry to database"""
-        if not self.db_session:
+                   resource_type: str, resource_id: str, details_json: str,
+                   success: bool, error_message: str, ip_address: str = None,
+                   user_agent: str = None, db_session=None):
+        """Queue log entry for batched database write (or stage it in db_session)"""
+        if not self.db_session and db_session is None:
             return
         
-        from app.models import AuditLog
+        # Plain row dict: flushed with a Core executemany, no ORM unit of work
+        audit_entry = {
+            'timestamp': _now(),
+            'actor_type': actor_type,
+            'actor_id': actor_id,
+            'action': action,
+            'resource_type': resource_type,
+            'resource_id': str(resource_id) if resource_id else None,
+            'details': details_json,
+            'ip_address': ip_address,
+            'user_agent': user_agent,
+            'success': success,
+            'error_message': error_message
+        }
         
-        request_info = self._get_request_info()
+        if db_session is not None:
+            # Part of the caller's transaction, committed together with its changes
+            from app.models import AuditLog
+            db_session.execute(AuditLog.__table__.insert(), [audit_entry])
+            return
         
-        audit_entry = AuditLog(
-            timestamp=datetime.utcnow(),
-            actor_type=actor_type,
-            actor_id=actor_id,
-            action=action,
-            resource_type=resource_type,
-            resource_id=str(resource_id) if resource_id else None,
-            details=json.dumps(details, default=str) if details else None,
-            ip_address=request_info['ip_address'],
-            user_agent=request_info['user_agent'],
-            success=success,
-            error_message=error_message
-        )
+        with self._pending_lock:
+            self._pending.append(audit_entry)
+            due = (len(self._pending) >= self.config.AUDIT_BATCH_SIZE or
+                   time.monotonic() - self._last_flush >= self.config.AUDIT_FLUSH_INTERVAL)
+            if not due:
+                self._schedule_flush()
         
+        if due:
+            self.flush()
+        elif has_request_context():
+            # Web request events go out in one INSERT at request teardown
+            g._audit_pending = True
+    
+    def flush_request(self):
+        """Flush entries queued during the current request (called at teardown)"""
+        if g.pop('_audit_pending', False):
+            self.flush()
+    
+    def _schedule_flush(self):
+        """Make sure pending entries are written within AUDIT_FLUSH_INTERVAL (caller holds the lock)"""
+        if self._flush_timer is None:
+            self._flush_timer = threading.Timer(self.config.AUDIT_FLUSH_INTERVAL, self.flush)
+            self._flush_timer.daemon = True
+            self._flush_timer.start()
+    
+    def flush(self):
+        """Write all pending audit entries to database in a single transaction"""
+        from app.models import AuditLog
+        
+        with self._pending_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
+            self._last_flush = time.monotonic()
+            
+            if not self._pending or not self.db_session:
+                return
+            
+            batch = list(self._pending)
+            self._pending.clear()
+            bind = self.db_session.get_bind()
+        
+        # Own connection and transaction: never commits the caller's session.
+        # One INSERT statement executed for all rows (executemany).
         try:
-            self.db_session.add(audit_entry)
-            self.db_session.commit()
+            with bind.begin() as conn:
+                conn.execute(AuditLog.__table__.insert(), batch)
         except Exception as e:
-            self.db_session.rollback()
-            self._file_logger.error(f"Failed to write audit log to DB: {e}")
+            self._file_logger.error(f"Failed to write {len(batch)} audit log(s) to DB: {e}")
     
     def log(self, action: str, actor_type: str = 'system', actor_id: str = None,
             resource_type: str = None, resource_id: str = None, details: dict = None,
-            success: bool = True, error_message: str = None):
+            success: bool = True, error_message: str = None, db_session=None):
         """
         Log an audit event to both file and database.
         
+        With db_session, the DB row is added to that session's open
+        transaction instead of the batch queue; the caller commits it.
+        
         Args:
             action: Action performed (login, logout, backup_start, device_add, etc.)
             actor_type: Type of actor (admin, system, scheduler)
@@ -146,14 +309,22 @@ class AuditLogger:
             details: Additional details as dict
             success: Whether action was successful
             error_message: Error message if failed
+            db_session: Session whose next commit should include the audit row
         """
+        # Request info is computed once and shared by both sinks
+        ip_address, user_agent = self._get_request_info()
+        
         # Always log to file
         self._log_to_file(action, actor_type, actor_id, resource_type, 
-                         resource_id, details, success, error_message)
+                         resource_id, details, success, error_message, ip_address)
         
-        # Log to database if session available
+        # Log to database if session available (low-value actions stay file-only)
+        if action in self.config.AUDIT_DB_EXCLUDE:
+            return
+        details_json = _json_dumps(details) if details else None
         self._log_to_db(action, actor_type, actor_id, resource_type,
-                       resource_id, details, success, error_message)
+                       resource_id, details_json, success, error_message,
+                       ip_address, user_agent, db_session)
     
     # Convenience methods for common actions
     
@@ -240,7 +411,8 @@ class AuditLogger:
             error_message=error_message
         )
     
-    def log_schedule_add(self, admin_username: str, schedule_id: int, device_id: int):
+    def log_schedule_add(self, admin_username: str, schedule_id: int, device_id: int,
+                         db_session=None):
         """Log schedule addition"""
         self.log(
             action='schedule_add',
@@ -248,10 +420,12 @@ class AuditLogger:
             actor_id=admin_username,
             resource_type='schedule',
             resource_id=schedule_id,
-            details={'device_id': device_id}
+            details={'device_id': device_id},
+            db_session=db_session
         )
     
-    def log_schedule_update(self, admin_username: str, schedule_id: int, changes: dict):
+    def log_schedule_update(self, admin_username: str, schedule_id: int, changes: dict,
+                            db_session=None):
         """Log schedule update"""
         self.log(
             action='schedule_update',
@@ -259,14 +433,41 @@ class AuditLogger:
             actor_id=admin_username,
             resource_type='schedule',
             resource_id=schedule_id,
-            details={'changes': changes}
+            details={'changes': changes},
+            db_session=db_session
+        )
+    
+    def log_schedule_delete(self, admin_username: str, schedule_id: int, device_id: int,
+                            db_session=None):
+        """Log schedule deletion"""
+        self.log(
+            action='schedule_delete',
+            actor_type='admin',
+            actor_id=admin_username,
+            resource_type='schedule',
+            resource_id=schedule_id,
+            details={'device_id': device_id},
+            db_session=db_session
         )
 
 
-# Global audit logger instance
-audit_logger = AuditLogger()
+# Singleton instance (created on first use, not at import)
+_audit_instance = None
+_audit_instance_lock = threading.Lock()
 
 
 def get_audit_logger() -> AuditLogger:
     """Get the global audit logger instance"""
-    return audit_logger
+    global _audit_instance
+    if _audit_instance is None:
+        with _audit_instance_lock:
+            if _audit_instance is None:
+                _audit_instance = AuditLogger()
+    return _audit_instance
+
+
+def __getattr__(name):
+    # Keep the old module-level `audit_logger` name working, lazily
+    if name == 'audit_logger':
+        return get_audit_logger()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -9,15 +9,93 @@ Features:
 - Login/logout audit logging
 """
 
+import os
+import hmac
+import time
+import hashlib
+import threading
 import bcrypt
+from collections import OrderedDict
 from datetime import datetime
 from functools import wraps
-from flask import session, redirect, url_for, flash, request
+from flask import session, redirect, url_for, flash, request, g
+from sqlalchemy import select, bindparam
 
+from config import get_config
 from app.models import Admin
 from app.audit import get_audit_logger
 
 
+# Short-lived cache of bcrypt results, so repeated attempts with the same
+# credential don't each pay the full hashing cost. Keys hold an HMAC digest
+# with a process-local secret, never the plaintext password.
+_VERIFY_CACHE_MAX = 128
+_VERIFY_CACHE_SECRET = os.urandom(32)
+_verify_cache = OrderedDict()
+_verify_cache_lock = threading.Lock()
+
+
+# Prebuilt statements for the login/session hot path (bound values, reused SQL)
+_ADMIN_BY_USERNAME = select(Admin).where(
+    Admin.username == bindparam('username'),
+    Admin.is_active.is_(True)
+).limit(1)
+_ADMIN_BY_ID = select(Admin).where(Admin.id == bindparam('admin_id')).limit(1)
+_ACTIVE_ADMIN = select(Admin).where(Admin.is_active.is_(True)).limit(1)
+_ANY_ADMIN_ID = select(Admin.id).limit(1)
+
+
+# Password version per admin id, re-read from DB at most every _PWD_VERSION_TTL seconds.
+# Lets login_required trust the signed session cookie without a SELECT per request,
+# while still ending other sessions shortly after a password change or reset.
+_PWD_VERSION_TTL = 30
+_pwd_versions = {}
+_pwd_versions_lock = threading.Lock()
+
+
+def _password_version(password_hash: str) -> str:
+    """Short fingerprint of the password hash, safe to keep in the session cookie"""
+    return hashlib.sha256(password_hash.encode()).hexdigest()[:16]
+
+
+def _remember_password_version(admin_id: int, password_hash: str):
+    """Update the in-process password version for an admin"""
+    with _pwd_versions_lock:
+        _pwd_versions[admin_id] = (_password_version(password_hash), time.monotonic())
+
+
+def _current_password_version(db_session, admin_id: int):
+    """Get password version for admin (None if admin is gone or inactive)"""
+    with _pwd_versions_lock:
+        cached = _pwd_versions.get(admin_id)
+    if cached is not None and time.monotonic() - cached[1] < _PWD_VERSION_TTL:
+        return cached[0]
+    
+    admin = db_session.execute(_ADMIN_BY_ID, {'admin_id': admin_id}).scalar()
+    if admin is None or not admin.is_active:
+        with _pwd_versions_lock:
+            _pwd_versions.pop(admin_id, None)
+        return None
+    
+    _remember_password_version(admin.id, admin.password_hash)
+    return _password_version(admin.password_hash)
+
+
+class AdminProxy:
+    """Logged-in admin identity taken from the signed session (no DB access)"""
+    __slots__ = ('id', 'username')
+    
+    def __init__(self, admin_id: int, username: str):
+        self.id = admin_id
+        self.username = username
+
+
+def _verify_cache_key(password: str, password_hash: str) -> tuple:
+    """Build cache key from HMAC of password and the stored hash"""
+    digest = hmac.new(_VERIFY_CACHE_SECRET, password.encode(), hashlib.sha256).digest()
+    return (digest[:16], password_hash)
+
+
 class AuthService:
     """
     Authentication service for single admin account.
@@ -37,13 +115,33 @@ class AuthService:
     @staticmethod
     def hash_password(password: str) -> str:
         """Hash password using bcrypt"""
-        salt = bcrypt.gensalt(rounds=12)
+        salt = bcrypt.gensalt(rounds=get_config().BCRYPT_ROUNDS)
         return bcrypt.hashpw(password.encode(), salt).decode()
     
     @staticmethod
     def verify_password(password: str, password_hash: str) -> bool:
         """Verify password against bcrypt hash"""
-        return bcrypt.checkpw(password.encode(), password_hash.encode())
+        ttl = get_config().PASSWORD_VERIFY_CACHE_TTL
+        if ttl <= 0:
+            return bcrypt.checkpw(password.encode(), password_hash.encode())
+        
+        key = _verify_cache_key(password, password_hash)
+        now = time.monotonic()
+        with _verify_cache_lock:
+            cached = _verify_cache.get(key)
+            if cached is not None and cached[1] > now:
+                _verify_cache.move_to_end(key)
+                return cached[0]
+        
+        result = bcrypt.checkpw(password.encode(), password_hash.encode())
+        
+        with _verify_cache_lock:
+            _verify_cache[key] = (result, now + ttl)
+            _verify_cache.move_to_end(key)
+            while len(_verify_cache) > _VERIFY_CACHE_MAX:
+                _verify_cache.popitem(last=False)
+        
+        return result
     
     def create_admin(self, username: str, password: str) -> Admin:
         """
@@ -90,10 +188,7 @@ class AuthService:
         if not self.db_session:
             raise RuntimeError("Database session not set")
         
-        admin = self.db_session.query(Admin).filter(
-            Admin.username == username,
-            Admin.is_active == True
-        ).first()
+        admin = self.db_session.execute(_ADMIN_BY_USERNAME, {'username': username}).scalar()
         
         if not admin:
             self.audit.log_login(username, success=False, error_message="User not found")
@@ -135,6 +230,7 @@ class AuthService:
         
         admin.password_hash = self.hash_password(new_password)
         self.db_session.commit()
+        _remember_password_version(admin.id, admin.password_hash)
         
         self.audit.log(
             action='password_change',
@@ -150,13 +246,13 @@ class AuthService:
         if not self.db_session:
             raise RuntimeError("Database session not set")
         
-        return self.db_session.query(Admin).filter(Admin.is_active == True).first()
+        return self.db_session.execute(_ACTIVE_ADMIN).scalar()
     
     def admin_exists(self) -> bool:
         """Check if admin account exists"""
         if not self.db_session:
             return False
-        return self.db_session.query(Admin).first() is not None
+        return self.db_session.execute(_ANY_ADMIN_ID).scalar() is not None
 
 
 def login_required(f):
@@ -174,14 +270,38 @@ def login_required(f):
         if 'admin_id' not in session:
             flash('Please log in to access this page.', 'warning')
             return redirect(url_for('auth.login', next=request.url))
+        
+        # Session is stale if the password changed (or admin was removed) since login
+        current = _current_password_version(g.db_session, session['admin_id'])
+        if current is None or session.get('pwd_v') != current:
+            logout_admin()
+            flash('Your session has expired. Please log in again.', 'warning')
+            return redirect(url_for('auth.login', next=request.url))
         return f(*args, **kwargs)
     return decorated_function
 
 
-def get_current_admin(db_session) -> Admin:
+def get_current_admin(db_session=None) -> AdminProxy:
     """
     Get currently logged in admin from session.
     
+    Identity comes from the signed session cookie, so no DB query is made.
+    Use load_current_admin() when the Admin row itself is needed.
+    
+    Returns:
+        AdminProxy or None
+    """
+    admin_id = session.get('admin_id')
+    if not admin_id:
+        return None
+    
+    return AdminProxy(admin_id, session.get('admin_username'))
+
+
+def load_current_admin(db_session) -> Admin:
+    """
+    Load the logged in admin row from database (once per request).
+    
     Returns:
         Admin object or None
     """
@@ -189,14 +309,20 @@ def get_current_admin(db_session) -> Admin:
     if not admin_id:
         return None
     
-    return db_session.query(Admin).filter(Admin.id == admin_id).first()
+    admin = g.get('_current_admin')
+    if admin is None or admin.id != admin_id:
+        admin = db_session.execute(_ADMIN_BY_ID, {'admin_id': admin_id}).scalar()
+        g._current_admin = admin
+    return admin
 
 
 def login_admin(admin: Admin):
     """Store admin in session"""
     session['admin_id'] = admin.id
     session['admin_username'] = admin.username
+    session['pwd_v'] = _password_version(admin.password_hash)
     session.permanent = True
+    _remember_password_version(admin.id, admin.password_hash)
 
 
 def logout_admin():
@@ -204,6 +330,7 @@ def logout_admin():
     username = session.get('admin_username')
     session.pop('admin_id', None)
     session.pop('admin_username', None)
+    session.pop('pwd_v', None)
     return username
 
 
@@ -17,8 +17,14 @@ CRITICAL RULES:
 """
 
 import time
+import functools
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from datetime import datetime
-from typing import Dict, Optional
+from typing import Dict, FrozenSet, Iterator, Optional
+
+from sqlalchemy.orm import sessionmaker, undefer_group
 
 from config import get_config
 from app.adapters import get_adapter
@@ -27,6 +33,30 @@ from app.audit import get_audit_logger
 from app.models import Device, BackupHistory, BackupStatus
 
 
+_now = datetime.utcnow
+
+
+@dataclass(frozen=True)
+class VendorCfg:
+    """Resolved per-vendor backup settings (immutable at runtime)"""
+    backup_command: str
+    connection_types: FrozenSet[str]
+    output_extension: str
+
+
+@functools.lru_cache(maxsize=16)
+def _resolve_vendor(vendor_lower: str) -> Optional[VendorCfg]:
+    """Resolve HARDCODED vendor config once per vendor"""
+    entry = get_config().VENDOR_COMMANDS.get(vendor_lower)
+    if not entry:
+        return None
+    return VendorCfg(
+        backup_command=entry['backup_command'],
+        connection_types=frozenset(entry['connection_types']),
+        output_extension=entry['output_extension']
+    )
+
+
 class BackupCollector:
     """
     Active Backup Collector - Read-Only Device Access
@@ -55,9 +85,9 @@ class BackupCollector:
         self.db_session = db_session
         self.audit.set_db_session(db_session)
     
-    def _get_vendor_config(self, vendor: str) -> dict:
+    def _get_vendor_config(self, vendor: str) -> Optional[VendorCfg]:
         """Get vendor-specific configuration (HARDCODED)"""
-        return self.config.VENDOR_COMMANDS.get(vendor.lower())
+        return _resolve_vendor(vendor.lower())
     
     def _prepare_device_info(self, device: Device) -> dict:
         """Prepare device info dict for adapter"""
@@ -71,9 +101,11 @@ class BackupCollector:
             'connection_type': device.connection_type
         }
     
-    def _create_backup_history(self, device: Device, triggered_by: str = 'scheduler') -> BackupHistory:
+    def _create_backup_history(self, device: Device, triggered_by: str = 'scheduler',
+                               vendor_config: VendorCfg = None) -> BackupHistory:
         """Create initial backup history record"""
-        vendor_config = self._get_vendor_config(device.vendor)
+        if vendor_config is None:
+            vendor_config = self._get_vendor_config(device.vendor)
         
         history = BackupHistory(
             device_id=device.id,
@@ -81,13 +113,15 @@ class BackupCollector:
             device_ip=device.ip_address,
             vendor=device.vendor,
             connection_type=device.connection_type,
-            backup_command=vendor_config['backup_command'],
+            backup_command=vendor_config.backup_command,
             status=BackupStatus.RUNNING.value,
-            started_at=datetime.utcnow(),
+            started_at=_now(),
             triggered_by=triggered_by,
             retry_count=0
         )
         
+        # Committed right away (not held open during the device round-trip), so
+        # the backup is listed as running; results follow in _backup_txn's commit
         if self.db_session:
             self.db_session.add(history)
             self.db_session.commit()
@@ -99,7 +133,7 @@ class BackupCollector:
                                file_size: int = None, checksum: str = None,
                                error_message: str = None):
         """Update backup history with results"""
-        history.completed_at = datetime.utcnow()
+        history.completed_at = _now()
         history.execution_time_seconds = int(execution_time) if execution_time else None
         
         if success:
@@ -113,16 +147,38 @@ class BackupCollector:
             else:
                 history.status = BackupStatus.FAILED.value
             history.error_message = error_message
-        
-        if self.db_session:
-            self.db_session.commit()
     
-    def _update_device_status(self, device: Device, status: str):
-        """Update device last backup status"""
+    def _update_device_status(self, device: Device, status: str, backup_at: datetime = None):
+        """Update device last backup status (backup_at defaults to now)"""
         device.last_backup_status = status
-        device.last_backup_at = datetime.utcnow()
+        device.last_backup_at = backup_at or _now()
+    
+    @contextmanager
+    def _backup_txn(self, device: Device, history: BackupHistory):
+        """
+        Commit a device backup's results as one transaction.
         
+        The RUNNING history row already exists; its results and the device
+        status are only mutated in memory while the device is being contacted,
+        then committed once on exit. On an unexpected error the session is
+        rolled back and the row is committed as failed instead.
+        """
+        try:
+            yield
+        except Exception as e:
+            if self.db_session:
+                self.db_session.rollback()
+            self._update_backup_history(history, False, error_message=str(e))
+            self._update_device_status(device, BackupStatus.FAILED.value, history.completed_at)
+            self._commit_backup(history)
+            raise
+        else:
+            self._commit_backup(history)
+    
+    def _commit_backup(self, history: BackupHistory):
+        """Persist backup history results and device status in a single commit"""
         if self.db_session:
+            self.db_session.add(history)
             self.db_session.commit()
     
     def backup_device(self, device: Device, triggered_by: str = 'scheduler',
@@ -160,24 +216,32 @@ class BackupCollector:
             'device_name': device.name
         }
         
-        # Validate vendor
+        # Cheap validation first: no history row or start event for a misconfigured device
         vendor_config = self._get_vendor_config(device.vendor)
         if not vendor_config:
             result['error'] = f"Unsupported vendor: {device.vendor}"
-            return result
-        
-        # Check connection type support
-        if device.connection_type not in vendor_config['connection_types']:
+        elif device.connection_type not in vendor_config.connection_types:
             result['error'] = f"Connection type {device.connection_type} not supported for {device.vendor}"
+        
+        if result['error']:
+            self.audit.log_backup_complete(device.id, device.name, False, result['error'])
             return result
         
         # Log backup start
         self.audit.log_backup_start(device.id, device.name, triggered_by)
         
         # Create backup history record
-        history = self._create_backup_history(device, triggered_by)
-        result['history_id'] = history.id
+        history = self._create_backup_history(device, triggered_by, vendor_config)
         
+        with self._backup_txn(device, history):
+            self._execute_backup(device, history, vendor_config, result, retry)
+        
+        result['history_id'] = history.id
+        return result
+    
+    def _execute_backup(self, device: Device, history: BackupHistory,
+                        vendor_config: VendorCfg, result: Dict, retry: bool):
+        """Contact the device and store the backup, filling in result in place"""
         # Prepare device info
         device_info = self._prepare_device_info(device)
         
@@ -187,26 +251,45 @@ class BackupCollector:
         except ValueError as e:
             result['error'] = str(e)
             self._update_backup_history(history, False, error_message=str(e))
-            self._update_device_status(device, BackupStatus.FAILED.value)
+            self._update_device_status(device, BackupStatus.FAILED.value, history.completed_at)
             self.audit.log_backup_complete(device.id, device.name, False, str(e))
-            return result
+            return
         
-        # Execute backup
-        backup_result = adapter.backup()
+        # Execute backup, retrying in place on the same adapter and history
+        attempts = 1 + (self.config.MAX_RETRY if retry else 0)
+        for attempt in range(attempts):
+            if attempt > 0:
+                history.retry_count += 1
+            backup_result = adapter.backup()
+            if backup_result['success']:
+                break
         
         if backup_result['success']:
             # Save to immutable storage
-            storage_result = self.storage.save_backup(
-                vendor=device.vendor,
-                device_id=device.id,
-                device_name=device.name,
-                device_ip=device.ip_address,
-                connection_type=device.connection_type,
-                backup_command=vendor_config['backup_command'],
-                config_output=backup_result['output'],
-                output_extension=vendor_config['output_extension'],
-                execution_time=backup_result['execution_time']
-            )
+            if backup_result['output'] is None and backup_result.get('file_path'):
+                # Adapter left the config in a file (ZTE FTP upload): copy it, don't load it
+                storage_result = self.storage.save_backup_stream(
+                    vendor=device.vendor,
+                    device_id=device.id,
+                    device_ip=device.ip_address,
+                    connection_type=device.connection_type,
+                    backup_command=vendor_config.backup_command,
+                    src_path=backup_result['file_path'],
+                    output_extension=vendor_config.output_extension,
+                    execution_time=backup_result['execution_time']
+                )
+            else:
+                storage_result = self.storage.save_backup(
+                    vendor=device.vendor,
+                    device_id=device.id,
+                    device_name=device.name,
+                    device_ip=device.ip_address,
+                    connection_type=device.connection_type,
+                    backup_command=vendor_config.backup_command,
+                    config_output=backup_result['output'],
+                    output_extension=vendor_config.output_extension,
+                    execution_time=backup_result['execution_time']
+                )
             
             if storage_result['success']:
                 result['success'] = True
@@ -220,7 +303,7 @@ class BackupCollector:
                     file_size=storage_result['file_size'],
                     checksum=storage_result['checksum']
                 )
-                self._update_device_status(device, BackupStatus.SUCCESS.value)
+                self._update_device_status(device, BackupStatus.SUCCESS.value, history.completed_at)
                 self.audit.log_backup_complete(
                     device.id, device.name, True,
                     file_path=storage_result['file_path'],
@@ -229,71 +312,117 @@ class BackupCollector:
             else:
                 result['error'] = f"Storage error: {storage_result['error']}"
                 self._update_backup_history(history, False, error_message=result['error'])
-                self._update_device_status(device, BackupStatus.FAILED.value)
+                self._update_device_status(device, BackupStatus.FAILED.value, history.completed_at)
                 self.audit.log_backup_complete(device.id, device.name, False, result['error'])
         else:
             # Backup failed
             result['error'] = backup_result['error']
             
-            # Retry once if enabled and not already retried
-            if retry and history.retry_count < self.config.MAX_RETRY:
-                history.retry_count += 1
-                if self.db_session:
-                    self.db_session.commit()
-                
-                # Recursive call with retry=False to prevent infinite loop
-                retry_result = self.backup_device(device, triggered_by, retry=False)
-                
-                if retry_result['success']:
-                    return retry_result
-                
-                # Update with final failure
-                result['error'] = f"Failed after retry: {retry_result['error']}"
+            if history.retry_count > 0:
+                result['error'] = f"Failed after retry: {backup_result['error']}"
             
             self._update_backup_history(
                 history, False,
                 execution_time=backup_result.get('execution_time'),
                 error_message=result['error']
             )
-            self._update_device_status(device, BackupStatus.FAILED.value)
+            self._update_device_status(device, BackupStatus.FAILED.value, history.completed_at)
             self.audit.log_backup_complete(device.id, device.name, False, result['error'])
+    
+    def iter_backup_all_devices(self, triggered_by: str = 'manual') -> Iterator[Dict]:
+        """
+        Execute backup for all active devices, yielding results as they finish.
         
-        return result
+        Devices are backed up in parallel (up to BACKUP_CONCURRENCY workers),
+        each worker with its own database session. Results are yielded in
+        completion order, so callers can stream them instead of holding all.
+        
+        Yields:
+            Per-device result dict (see backup_device)
+        """
+        if not self.db_session:
+            raise RuntimeError("Database session not set")
+        
+        device_ids = [
+            row[0] for row in self.db_session.query(Device.id).filter(Device.is_active == True).all()
+        ]
+        if not device_ids:
+            return
+        
+        # Sessions are not thread-safe: every worker gets its own
+        session_factory = sessionmaker(bind=self.db_session.get_bind())
+        max_workers = max(1, min(self.config.BACKUP_CONCURRENCY, len(device_ids)))
+        
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self._backup_device_isolated, session_factory, device_id, triggered_by)
+                for device_id in device_ids
+            ]
+            
+            for future in as_completed(futures):
+                yield future.result()
     
-    def backup_all_devices(self, triggered_by: str = 'manual') -> Dict:
+    def backup_all_devices(self, triggered_by: str = 'manual', detailed: bool = False) -> Dict:
         """
         Execute backup for all active devices.
         
+        Args:
+            triggered_by: Who triggered the run
+            detailed: Also collect every per-device result
+        
         Returns:
             Dict with overall results:
                 - total: total devices
                 - success: successful backups
                 - failed: failed backups
-                - results: list of individual results
+                - results: list of individual results (only if detailed)
         """
-        if not self.db_session:
-            raise RuntimeError("Database session not set")
-        
         results = {
             'total': 0,
             'success': 0,
-            'failed': 0,
-            'results': []
+            'failed': 0
         }
+        if detailed:
+            results['results'] = []
         
-        devices = self.db_session.query(Device).filter(Device.is_active == True).all()
-        results['total'] = len(devices)
-        
-        for device in devices:
-            result = self.backup_device(device, triggered_by)
-            results['results'].append(result)
-            
+        for result in self.iter_backup_all_devices(triggered_by):
+            results['total'] += 1
             if result['success']:
                 results['success'] += 1
             else:
                 results['failed'] += 1
+            
+            if detailed:
+                results['results'].append(result)
         
         return results
+    
+    def _backup_device_isolated(self, session_factory, device_id: int, triggered_by: str) -> Dict:
+        """Back up one device with a private session and collector (worker thread)"""
+        db_session = session_factory()
+        
+        try:
+            device = db_session.get(Device, device_id, options=[
+                undefer_group('credentials')
+            ])
+            if device:
+                return BackupCollector(db_session).backup_device(device, triggered_by)
+            error = f"Device {device_id} not found"
+        except Exception as e:
+            db_session.rollback()
+            error = str(e)
+        finally:
+            db_session.close()
+        
+        return {
+            'success': False,
+            'history_id': None,
+            'file_path': None,
+            'checksum': None,
+            'error': error,
+            'device_id': device_id,
+            'device_name': None
+        }
 
 
 # Singleton instance
@@ -12,9 +12,11 @@ import os
 import base64
 import hashlib
 from cryptography.fernet import Fernet
-from cryptography.hazmat.primitives import hashes
-from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
-from cryptography.hazmat.backends import default_backend
+
+
+# Fernet tokens are urlsafe base64 of a 0x80 version byte + timestamp, so they
+# always start with this prefix. Legacy values were base64-encoded a second time.
+_FERNET_TOKEN_PREFIX = 'gAAAAA'
 
 
 class CredentialEncryption:
@@ -26,8 +28,17 @@ class CredentialEncryption:
     # Salt for key derivation (should be stored securely in production)
     SALT = b'leuitcss_v1_salt_2024'
     
+    # Supported key derivation functions (LEUITCSS_KDF).
+    # The KDF determines the key: switching it makes existing credentials
+    # undecryptable, so it must be chosen before any device is added.
+    KDF_PBKDF2 = 'pbkdf2'
+    KDF_SCRYPT = 'scrypt'
+    
     def __init__(self):
         self._fernet = None
+        self.kdf = os.environ.get('LEUITCSS_KDF', self.KDF_PBKDF2).lower()
+        if self.kdf not in (self.KDF_PBKDF2, self.KDF_SCRYPT):
+            raise ValueError(f"Unsupported LEUITCSS_KDF: {self.kdf}")
         self._initialize_encryption()
     
     def _initialize_encryption(self):
@@ -40,17 +51,69 @@ class CredentialEncryption:
                 "This is required for credential encryption."
             )
         
-        # Derive a 32-byte key using PBKDF2
-        kdf = PBKDF2HMAC(
-            algorithm=hashes.SHA256(),
-            length=32,
-            salt=self.SALT,
-            iterations=480000,  # OWASP recommended minimum
-            backend=default_backend()
+        key = base64.urlsafe_b64encode(self._load_or_derive_key(master_key))
+        self._fernet = Fernet(key)
+    
+    def _derive_key(self, master_key: str) -> bytes:
+        """Derive a 32-byte key using scrypt or PBKDF2-HMAC-SHA256 (OpenSSL via hashlib)"""
+        if self.kdf == self.KDF_SCRYPT:
+            return hashlib.scrypt(
+                master_key.encode(),
+                salt=self.SALT,
+                n=2 ** 14,
+                r=8,
+                p=1,
+                maxmem=64 * 1024 * 1024,
+                dklen=32
+            )
+        
+        return hashlib.pbkdf2_hmac(
+            'sha256',
+            master_key.encode(),
+            self.SALT,
+            480000,  # OWASP recommended minimum
+            dklen=32
         )
+    
+    def _key_cache_path(self, master_key: str) -> str:
+        """Cache file for the derived key, named by a fingerprint of KDF + salt + master key"""
+        material = self.SALT + master_key.encode()
+        if self.kdf != self.KDF_PBKDF2:
+            material = self.kdf.encode() + b':' + material
+        fingerprint = hashlib.sha256(material).hexdigest()[:16]
+        cache_dir = os.environ.get('LEUITCSS_KEY_CACHE_DIR', '/var/lib/leuitcss')
+        return os.path.join(cache_dir, f'.keycache_{fingerprint}')
+    
+    def _load_or_derive_key(self, master_key: str) -> bytes:
+        """
+        Load the derived key from the 0600 cache file, or derive and cache it.
         
-        key = base64.urlsafe_b64encode(kdf.derive(master_key.encode()))
-        self._fernet = Fernet(key)
+        Key derivation dominates process start, and its output only depends
+        on the KDF, master key and salt.
+        """
+        path = self._key_cache_path(master_key)
+        
+        try:
+            st = os.stat(path)
+            if (st.st_mode & 0o777) == 0o600 and st.st_uid == os.getuid():
+                with open(path, 'rb') as f:
+                    key = f.read()
+                if len(key) == 32:
+                    return key
+        except OSError:
+            pass
+        
+        key = self._derive_key(master_key)
+        
+        # Best effort: create exclusively with 0600, never overwrite an existing file
+        try:
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+            with os.fdopen(fd, 'wb') as f:
+                f.write(key)
+        except OSError:
+            pass
+        
+        return key
     
     def encrypt(self, plaintext: str) -> str:
         """
@@ -60,20 +123,19 @@ class CredentialEncryption:
             plaintext: The credential to encrypt (e.g., password)
             
         Returns:
-            Base64 encoded encrypted string
+            Fernet token string (already urlsafe base64)
         """
         if not plaintext:
             return ""
         
-        encrypted = self._fernet.encrypt(plaintext.encode())
-        return base64.urlsafe_b64encode(encrypted).decode()
+        return self._fernet.encrypt(plaintext.encode()).decode('ascii')
     
     def decrypt(self, ciphertext: str) -> str:
         """
         Decrypt encrypted credential.
         
         Args:
-            ciphertext: Base64 encoded encrypted string
+            ciphertext: Fernet token string (or legacy double-base64 value)
             
         Returns:
             Decrypted plaintext credential
@@ -81,9 +143,34 @@ class CredentialEncryption:
         if not ciphertext:
             return ""
         
-        encrypted = base64.urlsafe_b64decode(ciphertext.encode())
-        decrypted = self._fernet.decrypt(encrypted)
-        return decrypted.decode()
+        if ciphertext.startswith(_FERNET_TOKEN_PREFIX):
+            encrypted = ciphertext.encode('ascii')
+        else:
+            # Legacy rows: Fernet token wrapped in an extra base64 layer
+            encrypted = base64.urlsafe_b64decode(ciphertext.encode())
+        return self._fernet.decrypt(encrypted).decode()
+    
+    def decrypt_many(self, ciphertexts) -> list:
+        """
+        Decrypt several credentials in one call.
+        
+        Args:
+            ciphertexts: Iterable of encrypted strings (empty/None -> "")
+            
+        Returns:
+            List of plaintext credentials in the same order
+        """
+        fernet = self._fernet
+        prefix = _FERNET_TOKEN_PREFIX
+        plaintexts = []
+        for ciphertext in ciphertexts:
+            if not ciphertext:
+                plaintexts.append("")
+            elif ciphertext.startswith(prefix):
+                plaintexts.append(fernet.decrypt(ciphertext.encode('ascii')).decode())
+            else:
+                plaintexts.append(fernet.decrypt(base64.urlsafe_b64decode(ciphertext.encode())).decode())
+        return plaintexts
 
 
 # Singleton instance
@@ -98,13 +185,18 @@ def get_encryption() -> CredentialEncryption:
 
 
 def encrypt_credential(plaintext: str) -> str:
-    """Convenience function to encrypt a credential"""
-    return get_encryption().encrypt(plaintext)
+    """Convenience function to encrypt a credential (empty stays empty)"""
+    return get_encryption().encrypt(plaintext) if plaintext else ""
 
 
 def decrypt_credential(ciphertext: str) -> str:
-    """Convenience function to decrypt a credential"""
-    return get_encryption().decrypt(ciphertext)
+    """Convenience function to decrypt a credential (empty stays empty)"""
+    return get_encryption().decrypt(ciphertext) if ciphertext else ""
+
+
+def decrypt_credentials(ciphertexts) -> list:
+    """Convenience function to decrypt several credentials at once"""
+    return get_encryption().decrypt_many(ciphertexts)
 
 
 def generate_master_key() -> str:
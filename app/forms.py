@@ -12,6 +12,8 @@ Note: All forms are for READ-ONLY system configuration.
 NO forms for push/restore/edit config operations.
 """
 
+import re
+
 from flask_wtf import FlaskForm
 from wtforms import (
     StringField, PasswordField, SelectField, IntegerField,
@@ -25,6 +27,21 @@ from wtforms.validators import (
 from config import get_config
 
 
+# Schedule day formats: comma-separated 0-6, and 1-31 or 'last'
+_DOW_RE = re.compile(r'\s*0*[0-6]\s*(?:,\s*0*[0-6]\s*)*')
+_DOM_RE = re.compile(r'last|0*(?:[1-9]|[12][0-9]|3[01])')
+
+# Supported connection types per vendor, resolved once at import:
+# vendor -> (frozenset for lookup, tuple in config order for messages)
+_VENDOR_CONN_TYPES = {
+    vendor: (frozenset(types), tuple(types))
+    for vendor, types in (
+        (vendor, cfg.get('connection_types', ['ssh']))
+        for vendor, cfg in get_config().VENDOR_COMMANDS.items()
+    )
+}
+
+
 class LoginForm(FlaskForm):
     """Admin login form"""
     username = StringField('Username', validators=[
@@ -103,15 +120,12 @@ class DeviceForm(FlaskForm):
     
     def validate_connection_type(self, field):
         """Validate connection type is supported by vendor"""
-        config = get_config()
-        vendor_config = config.VENDOR_COMMANDS.get(self.vendor.data)
+        conn_types = _VENDOR_CONN_TYPES.get(self.vendor.data)
         
-        if vendor_config:
-            supported = vendor_config.get('connection_types', ['ssh'])
-            if field.data not in supported:
-                raise ValidationError(
-                    f"{self.vendor.data} only supports: {', '.join(supported)}"
-                )
+        if conn_types and field.data not in conn_types[0]:
+            raise ValidationError(
+                f"{self.vendor.data} only supports: {', '.join(conn_types[1])}"
+            )
 
 
 class DeviceEditForm(DeviceForm):
@@ -174,23 +188,18 @@ class ScheduleForm(FlaskForm):
     def validate_day_of_week(self, field):
         """Validate day of week format for weekly schedule"""
         if self.frequency.data == 'weekly' and field.data:
-            days = field.data.split(',')
-            for day in days:
-                day = day.strip()
-                if not day.isdigit() or int(day) < 0 or int(day) > 6:
-                    raise ValidationError(
-                        "Days must be 0-6 (0=Monday, 6=Sunday), comma-separated"
-                    )
+            if not _DOW_RE.fullmatch(field.data):
+                raise ValidationError(
+                    "Days must be 0-6 (0=Monday, 6=Sunday), comma-separated"
+                )
     
     def validate_day_of_month(self, field):
         """Validate day of month format for monthly schedule"""
         if self.frequency.data == 'monthly' and field.data:
-            value = field.data.strip().lower()
-            if value != 'last':
-                if not value.isdigit() or int(value) < 1 or int(value) > 31:
-                    raise ValidationError(
-                        "Day must be 1-31 or 'last'"
-                    )
+            if not _DOM_RE.fullmatch(field.data.strip().lower()):
+                raise ValidationError(
+                    "Day must be 1-31 or 'last'"
+                )
 
 
 class PasswordChangeForm(FlaskForm):
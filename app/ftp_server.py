@@ -19,6 +19,7 @@ The device name folder maps to device.name in LeuitCSS database.
 import os
 import logging
 import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
 from typing import Optional
@@ -26,7 +27,7 @@ from typing import Optional
 try:
     from pyftpdlib.authorizers import DummyAuthorizer
     from pyftpdlib.handlers import FTPHandler
-    from pyftpdlib.servers import FTPServer
+    from pyftpdlib.servers import ThreadedFTPServer
     FTP_AVAILABLE = True
 except ImportError:
     FTP_AVAILABLE = False
@@ -35,6 +36,43 @@ from config import get_config
 
 logger = logging.getLogger('leuitcss.ftp')
 
+# Passive data ports (pyftpdlib copies this into a list per PASV and picks randomly)
+_PASSIVE_PORTS = tuple(range(60000, 60100))
+
+# Configuration is static for the process lifetime - load it once
+# (pyftpdlib builds a new handler per connection)
+_CONFIG = None
+
+
+def _cfg():
+    """Get cached configuration instance"""
+    global _CONFIG
+    _CONFIG = _CONFIG or get_config()
+    return _CONFIG
+
+
+_default_session_factory = None
+_default_session_factory_lock = threading.Lock()
+
+
+def _get_default_session_factory():
+    """Create the DB session factory once (standalone use without the Flask app)"""
+    global _default_session_factory
+    if _default_session_factory is None:
+        with _default_session_factory_lock:
+            if _default_session_factory is None:
+                from sqlalchemy import create_engine
+                from sqlalchemy.orm import sessionmaker, scoped_session
+                from app.models import configure_sqlite
+                
+                engine = create_engine(
+                    _cfg().SQLALCHEMY_DATABASE_URI,
+                    connect_args={'check_same_thread': False}
+                )
+                configure_sqlite(engine)
+                _default_session_factory = scoped_session(sessionmaker(bind=engine))
+    return _default_session_factory
+
 
 class LeuitFTPAuthorizer(DummyAuthorizer):
     """
@@ -45,7 +83,7 @@ class LeuitFTPAuthorizer(DummyAuthorizer):
     
     def __init__(self):
         super().__init__()
-        self.config = get_config()
+        self.config = _cfg()
     
     def add_leuit_user(self, username: str, password: str, homedir: str):
         """Add FTP user with write-only permissions"""
@@ -68,9 +106,20 @@ class LeuitFTPHandler(FTPHandler):
     - Creates backup history record
     """
     
+    # scoped_session registry shared by all connections (set by FTPIngestionServer.start)
+    session_factory = None
+    
+    # App modules, bound once by _lazy_init
+    _Device = None
+    _BackupHistory = None
+    _get_storage = None
+    
+    # Ingestion runs here, so the FTP loop thread keeps serving uploads
+    _executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='ftp-ingest')
+    
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.config = get_config()
+        self.config = _cfg()
     
     def on_file_received(self, file: str):
         """Called when a file upload is complete"""
@@ -95,96 +144,113 @@ class LeuitFTPHandler(FTPHandler):
             
             device_name = parts[-2]  # Parent folder is device name
             
-            # Process the backup
-            self._process_zte_backup(device_name, file_path)
+            # Process the backup off the FTP loop thread
+            self._executor.submit(self._process_zte_backup_safe, device_name, file_path)
             
         except Exception as e:
             logger.error(f"FTP file processing error: {e}")
     
+    def _process_zte_backup_safe(self, device_name: str, file_path: Path):
+        """Worker entry point: log instead of losing errors in the future"""
+        try:
+            self._process_zte_backup(device_name, file_path)
+        except Exception as e:
+            logger.error(f"FTP file processing error: {e}")
+    
+    @classmethod
+    def _lazy_init(cls):
+        """Import app modules once, on the first upload (keeps FTP server start light)"""
+        if cls._Device is None:
+            from app.models import Device, BackupHistory
+            from app.storage import get_storage
+            
+            cls._BackupHistory = BackupHistory
+            cls._get_storage = staticmethod(get_storage)
+            cls._Device = Device
+    
     def _process_zte_backup(self, device_name: str, file_path: Path):
         """Process received ZTE backup file"""
-        from app.models import Device, BackupHistory
-        from app.storage import get_storage
-        from app import create_app
+        self._lazy_init()
+        Device = self._Device
+        BackupHistory = self._BackupHistory
         
-        app = create_app()
-        with app.app_context():
-            from sqlalchemy.orm import Session
-            from app.models import get_engine
+        # Thread-local session from the shared registry; remove() hands the
+        # connection back to the engine pool for the next upload
+        session_registry = self.session_factory or _get_default_session_factory()
+        session = session_registry()
+        try:
+            # Find device by name
+            device = session.query(Device).filter(
+                Device.name == device_name,
+                Device.vendor == 'zte'
+            ).first()
             
-            engine = get_engine()
-            with Session(engine) as session:
-                # Find device by name
-                device = session.query(Device).filter(
-                    Device.name == device_name,
-                    Device.vendor == 'zte'
-                ).first()
-                
-                if not device:
-                    logger.warning(f"FTP: No ZTE device found with name: {device_name}")
-                    return
-                
-                logger.info(f"FTP: Processing backup for device: {device.name} (ID: {device.id})")
-                
-                # Read file content
-                try:
-                    with open(file_path, 'rb') as f:
-                        content = f.read()
-                except Exception as e:
-                    logger.error(f"FTP: Failed to read file: {e}")
-                    return
-                
-                # Create backup history record
-                history = BackupHistory(
-                    device_id=device.id,
-                    device_name=device.name,
-                    vendor=device.vendor,
-                    status='running',
-                    started_at=datetime.now(),
-                    triggered_by='ftp_ingestion'
+            if not device:
+                logger.warning(f"FTP: No ZTE device found with name: {device_name}")
+                return
+            
+            logger.info(f"FTP: Processing backup for device: {device.name} (ID: {device.id})")
+            
+            started_at = datetime.now()
+            
+            # Create backup history record
+            history = BackupHistory(
+                device_id=device.id,
+                device_name=device.name,
+                vendor=device.vendor,
+                status='running',
+                started_at=started_at,
+                triggered_by='ftp_ingestion'
+            )
+            session.add(history)
+            session.flush()
+            
+            # Stream file into LeuitCSS storage (never held in memory)
+            storage = self._get_storage()
+            store_result = storage.save_backup_stream(
+                vendor=device.vendor,
+                device_id=device.id,
+                device_ip=device.ip_address,
+                connection_type='ftp',
+                backup_command='ftp upload startrun.dat',
+                src_path=file_path,
+                output_extension='.dat',
+                execution_time=0
+            )
+            
+            completed_at = datetime.now()
+            history.completed_at = completed_at
+            
+            if store_result['success']:
+                # Update history
+                history.status = 'success'
+                history.file_path = store_result['file_path']
+                history.file_size_bytes = store_result['file_size']
+                history.checksum_sha256 = store_result['checksum']
+                history.execution_time_seconds = int(
+                    (completed_at - started_at).total_seconds()
                 )
-                session.add(history)
-                session.flush()
                 
-                # Store using LeuitCSS storage
-                storage = get_storage()
-                try:
-                    stored_path = storage.store_backup(
-                        device_id=device.id,
-                        vendor=device.vendor,
-                        content=content.decode('utf-8', errors='replace'),
-                        filename_prefix=f"zte_olt_{device.name}"
-                    )
-                    
-                    # Update history
-                    history.status = 'success'
-                    history.completed_at = datetime.now()
-                    history.file_path = stored_path
-                    history.file_size_bytes = len(content)
-                    history.execution_time_seconds = int(
-                        (history.completed_at - history.started_at).total_seconds()
-                    )
-                    
-                    # Update device
-                    device.last_backup_at = datetime.now()
-                    device.last_backup_status = 'success'
-                    
-                    logger.info(f"FTP: Backup stored successfully: {stored_path}")
-                    
-                except Exception as e:
-                    history.status = 'failed'
-                    history.completed_at = datetime.now()
-                    history.error_message = str(e)
-                    device.last_backup_status = 'failed'
-                    logger.error(f"FTP: Failed to store backup: {e}")
+                # Update device
+                device.last_backup_at = completed_at
+                device.last_backup_status = 'success'
                 
-                session.commit()
-                
-                # Clean up temp file
-                try:
-                    os.remove(file_path)
-                except:
-                    pass
+                logger.info(f"FTP: Backup stored successfully: {store_result['file_path']}")
+            else:
+                history.status = 'failed'
+                history.error_message = store_result['error']
+                device.last_backup_status = 'failed'
+                logger.error(f"FTP: Failed to store backup: {store_result['error']}")
+            
+            session.commit()
+            
+            # Clean up temp file
+            try:
+                os.remove(file_path)
+            except:
+                pass
+        finally:
+            session_registry.remove()
     
     def on_incomplete_file_received(self, file: str):
         """Called when upload is incomplete"""
@@ -228,7 +294,7 @@ class FTPIngestionServer:
         if self._initialized:
             return
         
-        self.config = get_config()
+        self.config = _cfg()
         self.server = None
         self.thread = None
         self.running = False
@@ -271,8 +337,15 @@ class FTPIngestionServer:
         
         logger.info(f"FTP directories created: {ftp_path}")
     
-    def start(self):
-        """Start FTP server in background thread"""
+    def start(self, session_factory=None):
+        """
+        Start FTP server in background thread.
+        
+        Args:
+            session_factory: DB session factory to reuse (e.g. the app's
+                             scoped_session); a private one is created once
+                             if omitted
+        """
         if not self.is_available():
             logger.info("FTP server not enabled or not available")
             return False
@@ -295,11 +368,16 @@ class FTPIngestionServer:
             # Create handler
             handler = LeuitFTPHandler
             handler.authorizer = authorizer
-            handler.passive_ports = range(60000, 60100)
+            handler.passive_ports = _PASSIVE_PORTS
+            from sqlalchemy.orm import scoped_session
+            session_factory = session_factory or _get_default_session_factory()
+            if not isinstance(session_factory, scoped_session):
+                session_factory = scoped_session(session_factory)
+            handler.session_factory = session_factory
             
-            # Create server
-            self.server = FTPServer(('0.0.0.0', self.port), handler)
-            self.server.max_cons = 10
+            # Create server (one thread per connection, so OLT uploads run in parallel)
+            self.server = ThreadedFTPServer(('0.0.0.0', self.port), handler)
+            self.server.max_cons = 50
             self.server.max_cons_per_ip = 3
             
             # Start in thread
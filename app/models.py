@@ -11,9 +11,9 @@ Models:
 """
 
 from datetime import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Enum
+from sqlalchemy import create_engine, event, Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Enum, Index, text
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import relationship, sessionmaker
+from sqlalchemy.orm import relationship, sessionmaker, deferred
 import enum
 
 Base = declarative_base()
@@ -49,6 +49,24 @@ class VendorType(enum.Enum):
     HUAWEI = 'huawei'
     ZTE = 'zte'
     JUNIPER = 'juniper'
+    GENERIC = 'generic'
+    GENERIC_SAVED = 'generic-saved'
+    GENERIC_STARTUP = 'generic-startup'
+
+
+def _enum_column_type(enum_class, name: str) -> Enum:
+    """
+    VARCHAR limited to the values of a Python enum by a CHECK constraint.
+    
+    Values are passed as plain strings, so the attribute stays a str
+    ('success', 'cisco', ...) and existing comparisons keep working.
+    """
+    return Enum(
+        *[member.value for member in enum_class],
+        name=name,
+        native_enum=False,
+        create_constraint=True
+    )
 
 
 class Admin(Base):
@@ -85,17 +103,18 @@ class Device(Base):
     description = Column(Text, nullable=True)
     
     # Vendor (determines backup command - HARDCODED)
-    vendor = Column(String(20), nullable=False)  # mikrotik, cisco, huawei, zte, juniper
+    vendor = Column(_enum_column_type(VendorType, 'device_vendor'), nullable=False)  # Config.SUPPORTED_VENDORS
     
     # Connection Details
     ip_address = Column(String(45), nullable=False)  # IPv4 or IPv6
     port = Column(Integer, nullable=True)  # Custom port, uses default if null
-    connection_type = Column(String(10), nullable=False, default='ssh')  # ssh, telnet
+    connection_type = Column(_enum_column_type(ConnectionType, 'device_connection_type'), nullable=False, default='ssh')  # ssh, telnet
     
     # Credentials (ENCRYPTED with AES-256)
-    username = Column(String(255), nullable=False)  # Encrypted
-    password = Column(String(255), nullable=False)  # Encrypted
-    enable_password = Column(String(255), nullable=True)  # Encrypted, for Cisco enable mode
+    # Deferred: only loaded by backup paths, via undefer_group('credentials')
+    username = deferred(Column(String(255), nullable=False), group='credentials')  # Encrypted
+    password = deferred(Column(String(255), nullable=False), group='credentials')  # Encrypted
+    enable_password = deferred(Column(String(255), nullable=True), group='credentials')  # Encrypted, for Cisco enable mode
     
     # Status
     is_active = Column(Boolean, default=True)
@@ -124,12 +143,17 @@ class BackupSchedule(Base):
     - Monthly: Specific day of month at specified time
     """
     __tablename__ = 'backup_schedules'
+    __table_args__ = (
+        # Active schedules by next run (partial: inactive rows are not indexed).
+        # Serves the scheduler's startup load and "next due" lookups.
+        Index('ix_sched_active_next_run', 'next_run', sqlite_where=text('is_active = 1')),
+    )
     
     id = Column(Integer, primary_key=True)
-    device_id = Column(Integer, ForeignKey('devices.id'), nullable=False)
+    device_id = Column(Integer, ForeignKey('devices.id'), nullable=False, index=True)
     
     # Schedule Configuration
-    frequency = Column(String(10), nullable=False)  # daily, weekly, monthly
+    frequency = Column(_enum_column_type(ScheduleFrequency, 'schedule_frequency'), nullable=False)  # daily, weekly, monthly
     time_hour = Column(Integer, nullable=False)  # 0-23 (HH)
     time_minute = Column(Integer, nullable=False, default=0)  # 0-59 (MM)
     
@@ -172,6 +196,12 @@ class BackupHistory(Base):
     - checksum_sha256
     """
     __tablename__ = 'backup_history'
+    __table_args__ = (
+        # device_detail / backup_list?device_id=: latest backups of one device
+        Index('ix_bh_device_started', 'device_id', 'started_at'),
+        # backup_list filters and backup_stats GROUP BY vendor, status
+        Index('ix_bh_vendor_status_started', 'vendor', 'status', 'started_at'),
+    )
     
     id = Column(Integer, primary_key=True)
     device_id = Column(Integer, ForeignKey('devices.id'), nullable=False)
@@ -179,15 +209,15 @@ class BackupHistory(Base):
     # Snapshot of device info at backup time
     device_name = Column(String(100), nullable=False)
     device_ip = Column(String(45), nullable=False)
-    vendor = Column(String(20), nullable=False)
-    connection_type = Column(String(10), nullable=False)
+    vendor = Column(_enum_column_type(VendorType, 'history_vendor'), nullable=False)
+    connection_type = Column(String(10), nullable=False)  # ssh, telnet, ftp (ZTE push)
     
     # Backup command used (HARDCODED per vendor)
     backup_command = Column(String(255), nullable=False)
     
     # Execution Details
-    status = Column(String(20), nullable=False)  # success, failed, timeout
-    started_at = Column(DateTime, nullable=False)
+    status = Column(_enum_column_type(BackupStatus, 'history_status'), nullable=False, index=True)  # success, failed, timeout
+    started_at = Column(DateTime, nullable=False, index=True)
     completed_at = Column(DateTime, nullable=True)
     execution_time_seconds = Column(Integer, nullable=True)  # Duration in seconds
     
@@ -223,13 +253,23 @@ class AuditLog(Base):
     IMMUTABLE: Append-only, never modified or deleted.
     """
     __tablename__ = 'audit_logs'
+    __table_args__ = (
+        # Audit trail of one device/schedule/backup
+        Index('ix_audit_resource', 'resource_type', 'resource_id'),
+        # Schedule events carry the device in details; SQLite JSON1 reads the TEXT column directly
+        Index(
+            'ix_audit_schedule_device',
+            text("json_extract(details, '$.device_id')"),
+            sqlite_where=text("resource_type = 'schedule'")
+        ),
+    )
     
     id = Column(Integer, primary_key=True)
-    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+    timestamp = Column(DateTime, default=datetime.utcnow, nullable=False, index=True)
     
     # Actor
     actor_type = Column(String(20), nullable=False)  # admin, system, scheduler
-    actor_id = Column(String(50), nullable=True)  # admin username or 'system'
+    actor_id = Column(String(50), nullable=True, index=True)  # admin username or 'system'
     
     # Action
     action = Column(String(50), nullable=False)  # login, logout, device_add, backup_start, etc.
@@ -237,7 +277,7 @@ class AuditLog(Base):
     resource_id = Column(String(50), nullable=True)
     
     # Details
-    details = Column(Text, nullable=True)  # JSON string with additional info
+    details = Column(Text, nullable=True)  # JSON string with additional info (query with json_extract)
     ip_address = Column(String(45), nullable=True)  # Client IP
     user_agent = Column(String(255), nullable=True)
     
@@ -249,10 +289,54 @@ class AuditLog(Base):
         return f"<AuditLog {self.action} by {self.actor_id} at {self.timestamp}>"
 
 
+def configure_sqlite(engine):
+    """
+    Apply SQLite PRAGMAs on every new connection.
+    
+    - WAL: commits append to a log instead of rewriting B-tree pages,
+      and readers don't block the writer
+    - synchronous=NORMAL: fsync at checkpoints only. A power loss may
+      drop the last few commits but never corrupts the database
+    - busy_timeout: wait for a lock instead of failing immediately
+      (scheduler threads and web requests write concurrently)
+    - mmap_size: read database pages through a memory map instead of
+      read() syscalls into the page cache
+    """
+    if engine.dialect.name != 'sqlite':
+        return engine
+    
+    @event.listens_for(engine, 'connect')
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA journal_mode=WAL')
+        cursor.execute('PRAGMA synchronous=NORMAL')
+        cursor.execute('PRAGMA busy_timeout=5000')
+        cursor.execute('PRAGMA temp_store=MEMORY')
+        cursor.execute('PRAGMA cache_size=-20000')
+        cursor.execute('PRAGMA mmap_size=268435456')
+        cursor.close()
+    
+    return engine
+
+
+def create_indexes(engine):
+    """
+    Create any declared index missing from an existing database.
+    
+    create_all() only builds indexes together with a new table, so
+    databases created by earlier versions would never get them.
+    """
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
+
+
 def init_db(database_uri: str):
     """Initialize database and create all tables"""
-    engine = create_engine(database_uri)
+    connect_args = {'check_same_thread': False} if database_uri.startswith('sqlite') else {}
+    engine = configure_sqlite(create_engine(database_uri, connect_args=connect_args))
     Base.metadata.create_all(engine)
+    create_indexes(engine)
     return engine
 
 
@@ -14,7 +14,7 @@ from flask import Blueprint, render_template, redirect, url_for, flash, request,
 from app.forms import LoginForm, SetupForm, PasswordChangeForm
 from app.auth import (
     get_auth_service, login_admin, logout_admin, 
-    login_required, get_current_admin
+    login_required, load_current_admin
 )
 from app.audit import get_audit_logger
 
@@ -92,7 +92,7 @@ def forgot_password():
 def change_password():
     """Change admin password"""
     form = PasswordChangeForm()
-    admin = get_current_admin(g.db_session)
+    admin = load_current_admin(g.db_session)
     
     if form.validate_on_submit():
         auth_service = get_auth_service(g.db_session)
@@ -102,6 +102,8 @@ def change_password():
             current_password=form.current_password.data,
             new_password=form.new_password.data
         ):
+            # Keep this session valid under the new password version
+            login_admin(admin)
             flash('Password changed successfully!', 'success')
             return redirect(url_for('main.dashboard'))
         else:
@@ -3,7 +3,11 @@ LeuitCSS v1.0.0 - Backup Routes
 Backup history viewing, download, and statistics
 """
 
-from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, send_file, Response, g
+import time
+from datetime import datetime
+from urllib.parse import quote
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, send_file, jsonify, Response, current_app, g
+from sqlalchemy import func, or_, and_
 
 from app.auth import login_required
 from app.models import Device, BackupHistory
@@ -12,14 +16,91 @@ from app.storage import get_storage
 backup_bp = Blueprint('backup', __name__, url_prefix='/backups')
 
 
+# Filtered row counts for the pagination footer, keyed by filter values.
+# Counting scans every matching row, so it is refreshed at most every
+# _COUNT_CACHE_TTL seconds instead of on each page view.
+_COUNT_CACHE_TTL = 30
+_COUNT_CACHE_MAX = 256
+_count_cache = {}
+
+
+def _cached_count(query, key) -> int:
+    """Return the row count of a BackupHistory query, cached for _COUNT_CACHE_TTL seconds"""
+    now = time.monotonic()
+    cached = _count_cache.get(key)
+    if cached is not None and now - cached[1] < _COUNT_CACHE_TTL:
+        return cached[0]
+    
+    # Flat SELECT count(id) ... WHERE, not count(*) over a wrapped subquery
+    total = query.with_entities(func.count(BackupHistory.id)).scalar()
+    if len(_count_cache) >= _COUNT_CACHE_MAX:
+        _count_cache.clear()
+    _count_cache[key] = (total, now)
+    return total
+
+
+# Filter dropdown options (vendors, devices). They rarely change, so they are
+# reloaded after _FILTER_OPTIONS_TTL seconds or when device routes bump the version.
+_FILTER_OPTIONS_TTL = 60
+_filter_options = None
+_filter_options_version = 0
+
+
+def invalidate_filter_options():
+    """Reload filter options on next backup list view (after device add/edit/delete)"""
+    global _filter_options_version
+    _filter_options_version += 1
+
+
+def _get_filter_options(db_session) -> tuple:
+    """Return cached (vendors, devices) for the backup list filters"""
+    global _filter_options
+    now = time.monotonic()
+    cached = _filter_options
+    if (cached is not None and cached[2] == _filter_options_version and
+            now - cached[3] < _FILTER_OPTIONS_TTL):
+        return cached[0], cached[1]
+    
+    version = _filter_options_version
+    vendors = db_session.query(BackupHistory.vendor).distinct().all()
+    vendors = [v[0] for v in vendors if v[0]]
+    
+    # Only what the dropdown shows: no ORM objects, no credential columns
+    devices = db_session.query(Device.id, Device.name).order_by(Device.name).all()
+    
+    _filter_options = (vendors, devices, version, now)
+    return vendors, devices
+
+
+def _parse_cursor(before_ts: str, before_id: int):
+    """Parse the keyset cursor from query args (None if absent or invalid)"""
+    if not before_ts or not before_id:
+        return None
+    try:
+        return datetime.fromisoformat(before_ts), before_id
+    except ValueError:
+        return None
+
+
 @backup_bp.route('/')
 @login_required
 def backup_list():
-    """List all backup history"""
+    """
+    List all backup history.
+    
+    "Next" links carry a (started_at, id) cursor of the last row shown, so
+    walking forward seeks through the index instead of skipping OFFSET rows.
+    Jumping to a numbered page still uses OFFSET.
+    
+    The total (and numbered page links) is only computed with ?count=1;
+    otherwise Next/Previous rely on the over-fetched row.
+    """
     vendor = request.args.get('vendor')
     device_id = request.args.get('device_id', type=int)
     status = request.args.get('status')
-    page = request.args.get('page', 1, type=int)
+    page = max(request.args.get('page', 1, type=int), 1)
+    cursor = _parse_cursor(request.args.get('before_ts'), request.args.get('before_id', type=int))
+    with_count = request.args.get('count', type=int) == 1
     per_page = 25
     
     query = g.db_session.query(BackupHistory)
@@ -31,15 +112,31 @@ def backup_list():
     if status:
         query = query.filter(BackupHistory.status == status)
     
-    query = query.order_by(BackupHistory.started_at.desc())
+    total = _cached_count(query, (vendor, device_id, status)) if with_count else None
     
-    total = query.count()
-    backups = query.offset((page - 1) * per_page).limit(per_page).all()
+    if cursor:
+        before_ts, before_id = cursor
+        query = query.filter(or_(
+            BackupHistory.started_at < before_ts,
+            and_(BackupHistory.started_at == before_ts, BackupHistory.id < before_id)
+        ))
     
-    vendors = g.db_session.query(BackupHistory.vendor).distinct().all()
-    vendors = [v[0] for v in vendors if v[0]]
+    query = query.order_by(BackupHistory.started_at.desc(), BackupHistory.id.desc())
+    
+    if not cursor:
+        query = query.offset((page - 1) * per_page)
+    
+    # One extra row tells whether a next page exists
+    backups = query.limit(per_page + 1).all()
+    has_next = len(backups) > per_page
+    backups = backups[:per_page]
     
-    devices = g.db_session.query(Device).order_by(Device.name).all()
+    next_cursor = None
+    if has_next:
+        last = backups[-1]
+        next_cursor = {'before_ts': last.started_at.isoformat(), 'before_id': last.id}
+    
+    vendors, devices = _get_filter_options(g.db_session)
     
     return render_template('backup/list.html',
         backups=backups,
@@ -51,7 +148,10 @@ def backup_list():
         page=page,
         per_page=per_page,
         total=total,
-        total_pages=(total + per_page - 1) // per_page if total > 0 else 1
+        total_pages=(max((total + per_page - 1) // per_page, page + 1 if has_next else page)
+                     if total is not None else None),
+        has_next=has_next,
+        next_cursor=next_cursor
     )
 
 
@@ -59,30 +159,54 @@ def backup_list():
 @login_required
 def backup_detail(backup_id):
     """Backup detail page"""
-    backup = g.db_session.query(BackupHistory).filter(BackupHistory.id == backup_id).first()
+    backup = g.db_session.get(BackupHistory, backup_id)
     if not backup:
         abort(404)
     
     storage = get_storage()
     metadata = None
-    checksum_valid = None
     
+    # Checksum is verified by the page via backup_verify, not while rendering
     if backup.file_path:
         metadata = storage.get_metadata(backup.file_path)
-        checksum_valid = storage.verify_checksum(backup.file_path)
     
     return render_template('backup/detail.html',
         backup=backup,
-        metadata=metadata,
-        checksum_valid=checksum_valid
+        metadata=metadata
     )
 
 
+@backup_bp.route('/<int:backup_id>/verify')
+@login_required
+def backup_verify(backup_id):
+    """Re-hash the backup file and compare it with the stored checksum (JSON)"""
+    backup = g.db_session.get(BackupHistory, backup_id)
+    if not backup or not backup.file_path:
+        abort(404)
+    
+    storage = get_storage()
+    return jsonify({'valid': storage.verify_checksum(backup.file_path)})
+
+
+def _x_accel_response(prefix: str, relative_path: str, download_name: str) -> Response:
+    """Empty response telling nginx to serve the file from its internal location"""
+    response = Response(mimetype='application/octet-stream')
+    response.headers['X-Accel-Redirect'] = f"{prefix}/{quote(relative_path)}"
+    
+    try:
+        download_name.encode('ascii')
+        response.headers.set('Content-Disposition', 'attachment', filename=download_name)
+    except UnicodeEncodeError:
+        response.headers['Content-Disposition'] = f"attachment; filename*=UTF-8''{quote(download_name)}"
+    
+    return response
+
+
 @backup_bp.route('/<int:backup_id>/download')
 @login_required
 def backup_download(backup_id):
     """Download backup file"""
-    backup = g.db_session.query(BackupHistory).filter(BackupHistory.id == backup_id).first()
+    backup = g.db_session.get(BackupHistory, backup_id)
     if not backup:
         abort(404)
     
@@ -101,6 +225,10 @@ def backup_download(backup_id):
     ext = file_path.suffix
     download_name = f"{backup.device_name}_{backup.vendor}_{timestamp}{ext}"
     
+    accel_prefix = current_app.config.get('X_ACCEL_REDIRECT_PREFIX')
+    if accel_prefix:
+        return _x_accel_response(accel_prefix, backup.file_path, download_name)
+    
     return send_file(file_path, as_attachment=True, download_name=download_name)
 
 
@@ -108,7 +236,7 @@ def backup_download(backup_id):
 @login_required
 def backup_view(backup_id):
     """View backup content"""
-    backup = g.db_session.query(BackupHistory).filter(BackupHistory.id == backup_id).first()
+    backup = g.db_session.get(BackupHistory, backup_id)
     if not backup:
         abort(404)
     
@@ -117,84 +245,88 @@ def backup_view(backup_id):
         return redirect(url_for('backup.backup_detail', backup_id=backup_id))
     
     storage = get_storage()
-    content = storage.get_backup(backup.file_path)
     
-    if content is None:
+    if not storage.get_absolute_path(backup.file_path).exists():
         flash('Backup file not found.', 'danger')
         return redirect(url_for('backup.backup_detail', backup_id=backup_id))
     
-    return render_template('backup/view.html', backup=backup, content=content)
+    # The page only renders a shell; content is fetched from backup_raw
+    return render_template('backup/view.html', backup=backup)
 
 
 @backup_bp.route('/<int:backup_id>/raw')
 @login_required
 def backup_raw(backup_id):
-    """Get raw backup content"""
-    backup = g.db_session.query(BackupHistory).filter(BackupHistory.id == backup_id).first()
+    """Get raw backup content (streamed from disk, supports conditional/range requests)"""
+    backup = g.db_session.get(BackupHistory, backup_id)
     if not backup or not backup.file_path:
         abort(404)
     
     storage = get_storage()
-    content = storage.get_backup(backup.file_path)
+    file_path = storage.get_absolute_path(backup.file_path)
     
-    if content is None:
+    if not file_path.exists():
         abort(404)
     
-    return Response(content, mimetype='text/plain')
+    return send_file(file_path, mimetype='text/plain', conditional=True)
 
 
 @backup_bp.route('/stats')
 @login_required
 def backup_stats():
     """Backup statistics page"""
+    # Counts per (vendor, status) in one grouped query; overall and vendor stats pivot from it
+    status_counts = {}
+    vendor_counts = {}
+    for vendor_name, status, count in g.db_session.query(
+        BackupHistory.vendor,
+        BackupHistory.status,
+        func.count(BackupHistory.id)
+    ).group_by(BackupHistory.vendor, BackupHistory.status).all():
+        status_counts[status] = status_counts.get(status, 0) + count
+        if vendor_name:
+            counts = vendor_counts.setdefault(vendor_name, {})
+            counts[status] = counts.get(status, 0) + count
+    
     # Overall stats
-    total_backups = g.db_session.query(BackupHistory).count()
-    successful = g.db_session.query(BackupHistory).filter(BackupHistory.status == 'success').count()
-    failed = g.db_session.query(BackupHistory).filter(BackupHistory.status == 'failed').count()
-    timeout = g.db_session.query(BackupHistory).filter(BackupHistory.status == 'timeout').count()
+    total_backups = sum(status_counts.values())
+    successful = status_counts.get('success', 0)
+    failed = status_counts.get('failed', 0)
+    timeout = status_counts.get('timeout', 0)
     
-    # Stats by vendor - using simple queries
+    # Stats by vendor
     vendor_stats = []
-    vendor_rows = g.db_session.query(BackupHistory.vendor).distinct().all()
-    for row in vendor_rows:
-        vendor_name = row[0]
-        if vendor_name:
-            total = g.db_session.query(BackupHistory).filter(BackupHistory.vendor == vendor_name).count()
-            success = g.db_session.query(BackupHistory).filter(
-                BackupHistory.vendor == vendor_name,
-                BackupHistory.status == 'success'
-            ).count()
-            fail = g.db_session.query(BackupHistory).filter(
-                BackupHistory.vendor == vendor_name,
-                BackupHistory.status == 'failed'
-            ).count()
-            vendor_stats.append({
-                'vendor': vendor_name,
-                'total': total,
-                'success': success,
-                'failed': fail
-            })
+    for vendor_name, counts in vendor_counts.items():
+        vendor_stats.append({
+            'vendor': vendor_name,
+            'total': sum(counts.values()),
+            'success': counts.get('success', 0),
+            'failed': counts.get('failed', 0)
+        })
+    
+    # Stats by device: totals and latest backup per device in one grouped query
+    per_device = {
+        device_id: (total, last_backup)
+        for device_id, total, last_backup in g.db_session.query(
+            BackupHistory.device_id,
+            func.count(BackupHistory.id),
+            func.max(BackupHistory.started_at)
+        ).group_by(BackupHistory.device_id).all()
+    }
     
-    # Stats by device - using simple queries
     device_stats = []
     device_rows = g.db_session.query(
         BackupHistory.device_name,
         BackupHistory.device_id
     ).distinct().all()
-    for row in device_rows:
-        device_name, device_id = row[0], row[1]
+    for device_name, device_id in device_rows:
         if device_name:
-            total = g.db_session.query(BackupHistory).filter(
-                BackupHistory.device_id == device_id
-            ).count()
-            last = g.db_session.query(BackupHistory).filter(
-                BackupHistory.device_id == device_id
-            ).order_by(BackupHistory.started_at.desc()).first()
+            total, last_backup = per_device.get(device_id, (0, None))
             device_stats.append({
                 'device_name': device_name,
                 'device_id': device_id,
                 'total': total,
-                'last_backup': last.started_at if last else None
+                'last_backup': last_backup
             })
     
     # Storage stats
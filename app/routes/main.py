@@ -3,20 +3,33 @@ LeuitCSS v1.0.0 - Main Routes
 Dashboard, device management, and schedule management
 """
 
+import time
+import threading
 from datetime import datetime
-from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, g, session
+from flask import Blueprint, render_template, redirect, url_for, flash, request, abort, jsonify, g, session
+from sqlalchemy import func, case
+from sqlalchemy.orm import selectinload, undefer_group, contains_eager
 import logging
 
 from app.forms import DeviceForm, DeviceEditForm, ScheduleForm
 from app.auth import login_required, get_current_admin
 from app.encryption import encrypt_credential
+from app.adapters import clear_credential_cache
+from app.adapters_pool import get_connection_pool
 from app.audit import get_audit_logger
 from app.models import Device, BackupSchedule, BackupHistory
-from app.collector import get_collector
 from app.scheduler import get_scheduler
 from app.storage import get_storage
+from app.routes.backup import invalidate_filter_options
 from config import get_config
 
+# systemd D-Bus API (optional): service status without forking systemctl
+try:
+    from pystemd.systemd1 import Unit as SystemdUnit
+    PYSTEMD_AVAILABLE = True
+except ImportError:
+    PYSTEMD_AVAILABLE = False
+
 main_bp = Blueprint('main', __name__)
 logger = logging.getLogger('leuitcss.routes')
 
@@ -31,23 +44,30 @@ def index():
 @login_required
 def dashboard():
     """Main dashboard - overview of system status"""
-    total_devices = g.db_session.query(Device).count()
-    active_devices = g.db_session.query(Device).filter(Device.is_active == True).count()
-    
-    total_schedules = g.db_session.query(BackupSchedule).count()
-    active_schedules = g.db_session.query(BackupSchedule).filter(BackupSchedule.is_active == True).count()
+    # One pass per table: conditional aggregates instead of a COUNT per filter
+    total_devices, active_devices = g.db_session.query(
+        func.count(Device.id),
+        func.sum(case((Device.is_active == True, 1), else_=0))
+    ).one()
+    active_devices = active_devices or 0
+    
+    total_schedules, active_schedules = g.db_session.query(
+        func.count(BackupSchedule.id),
+        func.sum(case((BackupSchedule.is_active == True, 1), else_=0))
+    ).one()
+    active_schedules = active_schedules or 0
     
     recent_backups = g.db_session.query(BackupHistory).order_by(
         BackupHistory.started_at.desc()
     ).limit(10).all()
     
-    total_backups = g.db_session.query(BackupHistory).count()
-    successful_backups = g.db_session.query(BackupHistory).filter(
-        BackupHistory.status == 'success'
-    ).count()
-    failed_backups = g.db_session.query(BackupHistory).filter(
-        BackupHistory.status.in_(['failed', 'timeout'])
-    ).count()
+    # Per-status counts come straight from the status index
+    status_counts = dict(g.db_session.query(
+        BackupHistory.status, func.count(BackupHistory.id)
+    ).group_by(BackupHistory.status).all())
+    total_backups = sum(status_counts.values())
+    successful_backups = status_counts.get('success', 0)
+    failed_backups = status_counts.get('failed', 0) + status_counts.get('timeout', 0)
     
     storage = get_storage()
     storage_stats = storage.get_storage_stats()
@@ -112,6 +132,7 @@ def device_add():
         
         g.db_session.add(device)
         g.db_session.commit()
+        invalidate_filter_options()
         
         admin = get_current_admin(g.db_session)
         audit = get_audit_logger()
@@ -133,17 +154,20 @@ def device_add():
 @login_required
 def device_detail(device_id):
     """Device detail page"""
-    device = g.db_session.query(Device).filter(Device.id == device_id).first()
+    # Schedules come with the device; the template only reads loaded data
+    device = g.db_session.get(Device, device_id, options=[
+        selectinload(Device.schedules)
+    ])
     if not device:
         abort(404)
     
+    # Latest 50 only (served by the (device_id, started_at) index),
+    # so the full backup_history relationship is never loaded
     backups = g.db_session.query(BackupHistory).filter(
         BackupHistory.device_id == device_id
     ).order_by(BackupHistory.started_at.desc()).limit(50).all()
     
-    schedules = g.db_session.query(BackupSchedule).filter(
-        BackupSchedule.device_id == device_id
-    ).all()
+    schedules = device.schedules
     
     config = get_config()
     vendor_config = config.VENDOR_COMMANDS.get(device.vendor, {})
@@ -152,7 +176,8 @@ def device_detail(device_id):
         device=device,
         backups=backups,
         schedules=schedules,
-        vendor_config=vendor_config
+        vendor_config=vendor_config,
+        backup_pending=get_scheduler().is_backup_pending(device.id)
     )
 
 
@@ -160,7 +185,9 @@ def device_detail(device_id):
 @login_required
 def device_edit(device_id):
     """Edit device"""
-    device = g.db_session.query(Device).filter(Device.id == device_id).first()
+    device = g.db_session.get(Device, device_id, options=[
+        undefer_group('credentials')
+    ])
     if not device:
         abort(404)
     
@@ -168,6 +195,7 @@ def device_edit(device_id):
     
     if form.validate_on_submit():
         changes = {}
+        old_ip_address = device.ip_address
         
         if device.name != form.name.data:
             changes['name'] = {'old': device.name, 'new': form.name.data}
@@ -194,11 +222,21 @@ def device_edit(device_id):
             changes['enable_password'] = 'changed'
         
         g.db_session.commit()
+        invalidate_filter_options()
         
-        scheduler = get_scheduler()
-        for schedule in device.schedules:
-            if schedule.is_active:
-                scheduler.update_schedule(schedule, device)
+        # Don't keep the replaced credentials' plaintext in memory,
+        # nor sessions logged in with them
+        clear_credential_cache()
+        get_connection_pool().discard_host(old_ip_address)
+        
+        # One query for the active schedules (lazy device.schedules after commit
+        # would refresh each expired schedule separately)
+        active_schedules = g.db_session.query(BackupSchedule).filter(
+            BackupSchedule.device_id == device_id,
+            BackupSchedule.is_active == True
+        ).all()
+        
+        get_scheduler().update_schedules(active_schedules, device)
         
         admin = get_current_admin(g.db_session)
         audit = get_audit_logger()
@@ -221,11 +259,14 @@ def device_edit(device_id):
 @login_required
 def device_delete(device_id):
     """Delete device"""
-    device = g.db_session.query(Device).filter(Device.id == device_id).first()
+    device = g.db_session.get(Device, device_id, options=[
+        selectinload(Device.schedules)
+    ])
     if not device:
         abort(404)
     
     device_name = device.name
+    device_ip = device.ip_address
     
     scheduler = get_scheduler()
     for schedule in device.schedules:
@@ -233,6 +274,8 @@ def device_delete(device_id):
     
     g.db_session.delete(device)
     g.db_session.commit()
+    invalidate_filter_options()
+    get_connection_pool().discard_host(device_ip)
     
     admin = get_current_admin(g.db_session)
     audit = get_audit_logger()
@@ -246,8 +289,8 @@ def device_delete(device_id):
 @main_bp.route('/devices/<int:device_id>/backup', methods=['POST'])
 @login_required
 def device_backup(device_id):
-    """Trigger manual backup for device"""
-    device = g.db_session.query(Device).filter(Device.id == device_id).first()
+    """Queue manual backup for device (runs on the scheduler's worker pool)"""
+    device = g.db_session.get(Device, device_id)
     if not device:
         abort(404)
     
@@ -256,17 +299,10 @@ def device_backup(device_id):
         return redirect(url_for('main.device_detail', device_id=device.id))
     
     try:
-        # Get collector with current db session
-        collector = get_collector()
-        collector.set_db_session(g.db_session)
-        
-        # Execute backup
-        result = collector.backup_device(device, triggered_by='manual')
-        
-        if result['success']:
-            flash(f'Backup successful! File saved.', 'success')
+        if get_scheduler().queue_backup(device.id, triggered_by='manual'):
+            flash('Backup queued. This page updates when it finishes.', 'info')
         else:
-            flash(f'Backup failed: {result.get("error", "Unknown error")}', 'danger')
+            flash('A backup for this device is already in progress.', 'warning')
             
     except Exception as e:
         logger.exception(f"Backup error for device {device_id}: {e}")
@@ -275,6 +311,21 @@ def device_backup(device_id):
     return redirect(url_for('main.device_detail', device_id=device.id))
 
 
+@main_bp.route('/devices/<int:device_id>/backup/status')
+@login_required
+def device_backup_status(device_id):
+    """Queued backup state and last result for device (JSON, polled by device detail)"""
+    device = g.db_session.get(Device, device_id)
+    if not device:
+        abort(404)
+    
+    return jsonify({
+        'pending': get_scheduler().is_backup_pending(device.id),
+        'last_backup_status': device.last_backup_status,
+        'last_backup_at': device.last_backup_at.isoformat() if device.last_backup_at else None
+    })
+
+
 # =============================================================================
 # Schedule Routes
 # =============================================================================
@@ -283,7 +334,10 @@ def device_backup(device_id):
 @login_required
 def schedules():
     """List all schedules"""
-    schedules = g.db_session.query(BackupSchedule).join(Device).order_by(
+    # Devices are populated from the ORDER BY join itself (no per-row lazy load)
+    schedules = g.db_session.query(BackupSchedule).join(Device).options(
+        contains_eager(BackupSchedule.device)
+    ).order_by(
         Device.name, BackupSchedule.frequency
     ).all()
     
@@ -296,7 +350,11 @@ def schedule_add():
     """Add new schedule"""
     form = ScheduleForm()
     
-    devices = g.db_session.query(Device).filter(Device.is_active == True).order_by(Device.name).all()
+    # Plain (id, name, vendor) rows: no ORM objects, and not expired by commit()
+    devices = g.db_session.query(Device.id, Device.name, Device.vendor).filter(
+        Device.is_active == True
+    ).order_by(Device.name).all()
+    devices_by_id = {d.id: d for d in devices}
     form.device_id.choices = [(d.id, f"{d.name} ({d.vendor})") for d in devices]
     
     if form.validate_on_submit():
@@ -311,18 +369,21 @@ def schedule_add():
         )
         
         g.db_session.add(schedule)
+        g.db_session.flush()  # Assigns schedule.id for the audit row
+        
+        # Audit row goes into the same transaction: one commit for both
+        admin = get_current_admin(g.db_session)
+        audit = get_audit_logger()
+        audit.log_schedule_add(admin.username, schedule.id, schedule.device_id,
+                               db_session=g.db_session)
         g.db_session.commit()
         
-        device = g.db_session.query(Device).filter(Device.id == schedule.device_id).first()
+        # Device row was loaded for the choices above (form validation guarantees it is there)
+        device = devices_by_id.get(form.device_id.data)
         if schedule.is_active and device:
             scheduler = get_scheduler()
             scheduler.add_schedule(schedule, device)
         
-        admin = get_current_admin(g.db_session)
-        audit = get_audit_logger()
-        audit.set_db_session(g.db_session)
-        audit.log_schedule_add(admin.username, schedule.id, schedule.device_id)
-        
         flash('Schedule added successfully!', 'success')
         return redirect(url_for('main.schedules'))
     
@@ -333,13 +394,17 @@ def schedule_add():
 @login_required
 def schedule_edit(schedule_id):
     """Edit schedule"""
-    schedule = g.db_session.query(BackupSchedule).filter(BackupSchedule.id == schedule_id).first()
+    schedule = g.db_session.get(BackupSchedule, schedule_id)
     if not schedule:
         abort(404)
     
     form = ScheduleForm(obj=schedule)
     
-    devices = g.db_session.query(Device).filter(Device.is_active == True).order_by(Device.name).all()
+    # Plain (id, name, vendor) rows: no ORM objects, and not expired by commit()
+    devices = g.db_session.query(Device.id, Device.name, Device.vendor).filter(
+        Device.is_active == True
+    ).order_by(Device.name).all()
+    devices_by_id = {d.id: d for d in devices}
     form.device_id.choices = [(d.id, f"{d.name} ({d.vendor})") for d in devices]
     
     if form.validate_on_submit():
@@ -358,9 +423,13 @@ def schedule_edit(schedule_id):
         schedule.day_of_month = form.day_of_month.data if form.frequency.data == 'monthly' else None
         schedule.is_active = form.is_active.data
         
+        admin = get_current_admin(g.db_session)
+        audit = get_audit_logger()
+        audit.log_schedule_update(admin.username, schedule.id, changes,
+                                  db_session=g.db_session)
         g.db_session.commit()
         
-        device = g.db_session.query(Device).filter(Device.id == schedule.device_id).first()
+        device = devices_by_id.get(form.device_id.data)
         scheduler = get_scheduler()
         
         if schedule.is_active and device:
@@ -368,11 +437,6 @@ def schedule_edit(schedule_id):
         else:
             scheduler.remove_schedule(schedule.id)
         
-        admin = get_current_admin(g.db_session)
-        audit = get_audit_logger()
-        audit.set_db_session(g.db_session)
-        audit.log_schedule_update(admin.username, schedule.id, changes)
-        
         flash('Schedule updated successfully!', 'success')
         return redirect(url_for('main.schedules'))
     
@@ -383,13 +447,18 @@ def schedule_edit(schedule_id):
 @login_required
 def schedule_delete(schedule_id):
     """Delete schedule"""
-    schedule = g.db_session.query(BackupSchedule).filter(BackupSchedule.id == schedule_id).first()
+    schedule = g.db_session.get(BackupSchedule, schedule_id)
     if not schedule:
         abort(404)
     
     scheduler = get_scheduler()
     scheduler.remove_schedule(schedule.id)
     
+    admin = get_current_admin(g.db_session)
+    audit = get_audit_logger()
+    audit.log_schedule_delete(admin.username, schedule.id, schedule.device_id,
+                              db_session=g.db_session)
+    
     g.db_session.delete(schedule)
     g.db_session.commit()
     
@@ -401,17 +470,172 @@ def schedule_delete(schedule_id):
 # Server Status Route
 # =============================================================================
 
-@main_bp.route('/server-status')
-@login_required
-def server_status():
-    """Server Status - Read-only observability page"""
+# Collected server status (systemctl calls, /proc reads, storage walk) is
+# reused for _SERVER_STATUS_TTL seconds across page loads.
+_SERVER_STATUS_TTL = 15
+_server_status_cache = None
+_server_status_lock = threading.Lock()
+
+# Previous /proc/stat (idle, total) jiffies, so CPU usage is a delta between samples
+_prev_cpu_sample = None
+
+
+def _systemd_show_dbus(units, properties) -> dict:
+    """Read unit properties over D-Bus (pystemd), formatted like systemctl show"""
+    info = {}
+    for unit_name in units:
+        unit = SystemdUnit(f"{unit_name}.service".encode())
+        unit.load()
+        
+        values = {}
+        for prop in properties:
+            interface = unit.Service if prop in ('MainPID', 'MemoryCurrent') else unit.Unit
+            value = getattr(interface, prop)
+            
+            if isinstance(value, bytes):
+                value = value.decode()
+            elif prop == 'MemoryCurrent':
+                value = '[not set]' if value >= 2 ** 64 - 1 else str(value)
+            elif prop.endswith('Timestamp'):
+                # usec since epoch -> "Thu 2026-01-30 10:15:30 WIB"
+                value = (datetime.fromtimestamp(value / 1e6).astimezone().strftime('%a %Y-%m-%d %H:%M:%S %Z')
+                         if value else 'n/a')
+            else:
+                value = str(value)
+            values[prop] = value
+        info[unit_name] = values
+    return info
+
+
+def _systemd_show(units, properties) -> dict:
+    """
+    Read properties of several systemd units.
+    
+    Uses the systemd D-Bus API when pystemd is installed, otherwise a
+    single systemctl call for all units.
+    
+    Returns:
+        {unit: {property: value}} (empty if systemd is unavailable)
+    """
     import subprocess
+    
+    if PYSTEMD_AVAILABLE:
+        try:
+            return _systemd_show_dbus(units, properties)
+        except Exception as e:
+            logger.debug(f"systemd D-Bus query failed, using systemctl: {e}")
+    
+    cmd = ['systemctl', 'show', *units, '--no-pager', '--property=' + ','.join(properties)]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return {}
+    if result.returncode != 0:
+        return {}
+    
+    # One block per unit, in argument order, separated by a blank line
+    blocks = result.stdout.strip().split('\n\n')
+    return {
+        unit: dict(line.split('=', 1) for line in block.splitlines() if '=' in line)
+        for unit, block in zip(units, blocks)
+    }
+
+
+def _uptime_since(systemd_timestamp: str):
+    """Format time since a systemd timestamp ("Thu 2026-01-30 10:15:30 WIB") as uptime"""
+    parts = systemd_timestamp.split()
+    if len(parts) < 3:
+        return None
+    
+    try:
+        started_dt = datetime.strptime(f"{parts[1]} {parts[2]}", '%Y-%m-%d %H:%M:%S')
+    except ValueError as e:
+        logger.debug(f"Failed to parse service uptime: {e}")
+        return None
+    
+    total_seconds = int((datetime.now() - started_dt).total_seconds())
+    days = total_seconds // 86400
+    hours = (total_seconds % 86400) // 3600
+    minutes = (total_seconds % 3600) // 60
+    seconds = total_seconds % 60
+    
+    if days > 0:
+        return f"{days} days {hours}:{minutes:02d}:{seconds:02d}"
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def _backup_history_totals(db_session):
+    """
+    Stored backup totals from BackupHistory: (bytes, files, oldest, newest).
+    
+    Every stored backup has a history row with its file size, so this is
+    one aggregate query instead of a walk over the storage tree.
+    """
+    file_count, total_size, oldest, newest = db_session.query(
+        func.count(BackupHistory.id),
+        func.sum(BackupHistory.file_size_bytes),
+        func.min(BackupHistory.started_at),
+        func.max(BackupHistory.started_at)
+    ).filter(BackupHistory.file_path.isnot(None)).one()
+    return total_size or 0, file_count, oldest, newest
+
+
+def _scan_backup_storage(backup_path):
+    """
+    Walk the storage tree on disk: (bytes, files, oldest, newest).
+    
+    Counts every file (configs, metadata and checksum sidecars).
+    Returns None if the storage path doesn't exist.
+    """
+    import os
+    
+    if not backup_path.exists():
+        return None
+    
+    total_size = 0
+    file_count = 0
+    oldest_time = None
+    newest_time = None
+    
+    # scandir walk: file type comes from the directory entry, one stat() per file
+    pending_dirs = [str(backup_path)]
+    while pending_dirs:
+        with os.scandir(pending_dirs.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    pending_dirs.append(entry.path)
+                elif entry.is_file():
+                    file_count += 1
+                    stat = entry.stat()
+                    total_size += stat.st_size
+                    mtime = stat.st_mtime
+                    
+                    if oldest_time is None or mtime < oldest_time:
+                        oldest_time = mtime
+                    if newest_time is None or mtime > newest_time:
+                        newest_time = mtime
+    
+    return (
+        total_size,
+        file_count,
+        datetime.fromtimestamp(oldest_time) if oldest_time else None,
+        datetime.fromtimestamp(newest_time) if newest_time else None
+    )
+
+
+def _collect_server_status(db_session, rescan: bool = False) -> dict:
+    """
+    Gather server, service, resource and backup storage information.
+    
+    Backup storage totals come from BackupHistory unless rescan is set,
+    which walks the storage directory instead.
+    """
+    global _prev_cpu_sample
     import os
     import platform
     from pathlib import Path
     
     config = get_config()
-    server_time = datetime.now()
     
     # Server Information
     server_info = {
@@ -447,7 +671,7 @@ def server_status():
     except:
         server_info['uptime'] = 'Unknown'
     
-    # Service Information - LeuitCSS main service
+    # Service Information - LeuitCSS main service and FTP service
     service_info = {
         'status': 'unknown',
         'uptime': 'N/A',
@@ -455,117 +679,42 @@ def server_status():
         'memory_usage': None,
         'pid': None
     }
-    
-    try:
-        result = subprocess.run(
-            ['systemctl', 'show', 'leuitcss', '--no-pager', 
-             '--property=ActiveState,MainPID,MemoryCurrent,ActiveEnterTimestamp'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            started_timestamp = None
-            for line in result.stdout.strip().split('\n'):
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    if key == 'ActiveState':
-                        service_info['status'] = 'running' if value == 'active' else value
-                    elif key == 'MainPID':
-                        service_info['pid'] = value if value != '0' else None
-                    elif key == 'MemoryCurrent':
-                        if value and value != '[not set]':
-                            try:
-                                mem_bytes = int(value)
-                                service_info['memory_usage'] = f"{mem_bytes / 1024 / 1024:.1f} MB"
-                            except:
-                                pass
-                    elif key == 'ActiveEnterTimestamp':
-                        if value and value not in ('n/a', ''):
-                            service_info['started_at'] = value
-                            started_timestamp = value
-            
-            # Calculate service uptime
-            if service_info['status'] == 'running' and started_timestamp:
-                try:
-                    # Parse systemd timestamp: "Thu 2026-01-30 10:15:30 WIB"
-                    # Remove timezone and parse
-                    parts = started_timestamp.split()
-                    if len(parts) >= 3:
-                        date_str = parts[1]  # 2026-01-30
-                        time_str = parts[2]  # 10:15:30
-                        datetime_str = f"{date_str} {time_str}"
-                        from datetime import datetime as dt
-                        started_dt = dt.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
-                        now_dt = dt.now()
-                        uptime_delta = now_dt - started_dt
-                        
-                        total_seconds = int(uptime_delta.total_seconds())
-                        days = total_seconds // 86400
-                        hours = (total_seconds % 86400) // 3600
-                        minutes = (total_seconds % 3600) // 60
-                        seconds = total_seconds % 60
-                        
-                        if days > 0:
-                            service_info['uptime'] = f"{days} days {hours}:{minutes:02d}:{seconds:02d}"
-                        else:
-                            service_info['uptime'] = f"{hours}:{minutes:02d}:{seconds:02d}"
-                except Exception as e:
-                    logger.debug(f"Failed to parse service uptime: {e}")
-    except:
-        pass
-    
-    # FTP Service Information
     ftp_service_info = {
         'status': 'stopped',
         'uptime': 'N/A',
         'pid': None
     }
     
-    try:
-        result = subprocess.run(
-            ['systemctl', 'show', 'leuitcss-ftp', '--no-pager',
-             '--property=ActiveState,MainPID,ActiveEnterTimestamp'],
-            capture_output=True, text=True, timeout=5
-        )
-        if result.returncode == 0:
-            started_timestamp = None
-            for line in result.stdout.strip().split('\n'):
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    if key == 'ActiveState':
-                        ftp_service_info['status'] = 'running' if value == 'active' else 'stopped'
-                    elif key == 'MainPID':
-                        ftp_service_info['pid'] = value if value != '0' else None
-                    elif key == 'ActiveEnterTimestamp':
-                        if value and value not in ('n/a', ''):
-                            started_timestamp = value
-            
-            # Calculate FTP service uptime
-            if ftp_service_info['status'] == 'running' and started_timestamp:
-                try:
-                    parts = started_timestamp.split()
-                    if len(parts) >= 3:
-                        date_str = parts[1]
-                        time_str = parts[2]
-                        datetime_str = f"{date_str} {time_str}"
-                        from datetime import datetime as dt
-                        started_dt = dt.strptime(datetime_str, '%Y-%m-%d %H:%M:%S')
-                        now_dt = dt.now()
-                        uptime_delta = now_dt - started_dt
-                        
-                        total_seconds = int(uptime_delta.total_seconds())
-                        days = total_seconds // 86400
-                        hours = (total_seconds % 86400) // 3600
-                        minutes = (total_seconds % 3600) // 60
-                        seconds = total_seconds % 60
-                        
-                        if days > 0:
-                            ftp_service_info['uptime'] = f"{days} days {hours}:{minutes:02d}:{seconds:02d}"
-                        else:
-                            ftp_service_info['uptime'] = f"{hours}:{minutes:02d}:{seconds:02d}"
-                except:
-                    pass
-    except:
-        pass
+    units = _systemd_show(('leuitcss', 'leuitcss-ftp'),
+                          ('ActiveState', 'MainPID', 'MemoryCurrent', 'ActiveEnterTimestamp'))
+    
+    main_unit = units.get('leuitcss')
+    if main_unit:
+        state = main_unit.get('ActiveState', 'unknown')
+        service_info['status'] = 'running' if state == 'active' else state
+        service_info['pid'] = main_unit.get('MainPID') if main_unit.get('MainPID') != '0' else None
+        
+        memory = main_unit.get('MemoryCurrent')
+        if memory and memory != '[not set]':
+            try:
+                service_info['memory_usage'] = f"{int(memory) / 1024 / 1024:.1f} MB"
+            except ValueError:
+                pass
+        
+        started = main_unit.get('ActiveEnterTimestamp')
+        if started and started != 'n/a':
+            service_info['started_at'] = started
+            if service_info['status'] == 'running':
+                service_info['uptime'] = _uptime_since(started) or 'N/A'
+    
+    ftp_unit = units.get('leuitcss-ftp')
+    if ftp_unit:
+        ftp_service_info['status'] = 'running' if ftp_unit.get('ActiveState') == 'active' else 'stopped'
+        ftp_service_info['pid'] = ftp_unit.get('MainPID') if ftp_unit.get('MainPID') != '0' else None
+        
+        started = ftp_unit.get('ActiveEnterTimestamp')
+        if ftp_service_info['status'] == 'running' and started and started != 'n/a':
+            ftp_service_info['uptime'] = _uptime_since(started) or 'N/A'
     
     # Resource Information
     resource_info = {
@@ -579,15 +728,21 @@ def server_status():
         'disk_percent': 0
     }
     
-    # CPU usage
+    # CPU usage (since the previous sample; since boot on the first one)
     try:
         with open('/proc/stat', 'r') as f:
             cpu_line = f.readline()
             cpu_values = cpu_line.split()[1:8]
             cpu_values = [int(v) for v in cpu_values]
-            idle = cpu_values[3]
+            idle = cpu_values[3] + cpu_values[4]  # idle + iowait
             total = sum(cpu_values)
-            resource_info['cpu_percent'] = round(((total - idle) / total) * 100, 1) if total > 0 else 0
+        
+        prev_idle, prev_total = _prev_cpu_sample or (0, 0)
+        _prev_cpu_sample = (idle, total)
+        
+        delta_total = total - prev_total
+        delta_idle = idle - prev_idle
+        resource_info['cpu_percent'] = round(((delta_total - delta_idle) / delta_total) * 100, 1) if delta_total > 0 else 0
     except:
         pass
     
@@ -630,6 +785,7 @@ def server_status():
     backup_path = Path(config.STORAGE_PATH if hasattr(config, 'STORAGE_PATH') else '/var/lib/leuitcss/storage')
     backup_storage = {
         'path': str(backup_path),
+        'source': 'disk' if rescan else 'history',
         'total_size': '0 B',
         'total_files': 0,
         'avg_file_size': None,
@@ -638,23 +794,13 @@ def server_status():
     }
     
     try:
-        if backup_path.exists():
-            total_size = 0
-            file_count = 0
-            oldest_time = None
-            newest_time = None
-            
-            for file_path in backup_path.rglob('*'):
-                if file_path.is_file():
-                    file_count += 1
-                    stat = file_path.stat()
-                    total_size += stat.st_size
-                    mtime = stat.st_mtime
-                    
-                    if oldest_time is None or mtime < oldest_time:
-                        oldest_time = mtime
-                    if newest_time is None or mtime > newest_time:
-                        newest_time = mtime
+        if rescan:
+            totals = _scan_backup_storage(backup_path)
+        else:
+            totals = _backup_history_totals(db_session)
+        
+        if totals:
+            total_size, file_count, oldest_time, newest_time = totals
             
             backup_storage['total_files'] = file_count
             
@@ -680,19 +826,51 @@ def server_status():
             
             # Format dates
             if oldest_time:
-                backup_storage['oldest_backup'] = datetime.fromtimestamp(oldest_time).strftime('%Y-%m-%d %H:%M')
+                backup_storage['oldest_backup'] = oldest_time.strftime('%Y-%m-%d %H:%M')
             if newest_time:
-                backup_storage['newest_backup'] = datetime.fromtimestamp(newest_time).strftime('%Y-%m-%d %H:%M')
-    except:
-        pass
+                backup_storage['newest_backup'] = newest_time.strftime('%Y-%m-%d %H:%M')
+    except Exception as e:
+        logger.debug(f"Failed to collect backup storage info: {e}")
+    
+    return {
+        'server_info': server_info,
+        'service_info': service_info,
+        'ftp_service_info': ftp_service_info,
+        'resource_info': resource_info,
+        'backup_storage': backup_storage
+    }
+
+
+@main_bp.route('/server-status')
+@login_required
+def server_status():
+    """
+    Server Status - Read-only observability page.
+    
+    ?refresh=1 bypasses the cache, ?rescan=1 also walks the storage
+    directory instead of summing BackupHistory.
+    """
+    global _server_status_cache
+    
+    server_time = datetime.now()
+    rescan = request.args.get('rescan') == '1'
+    force = rescan or request.args.get('refresh') == '1'
+    
+    def is_fresh(entry):
+        return entry is not None and time.monotonic() - entry[1] < _SERVER_STATUS_TTL
+    
+    cached = _server_status_cache
+    if force or not is_fresh(cached):
+        # One collector at a time; requests that waited reuse what it collected
+        with _server_status_lock:
+            cached = _server_status_cache
+            if force or not is_fresh(cached):
+                cached = (_collect_server_status(g.db_session, rescan), time.monotonic())
+                _server_status_cache = cached
     
     return render_template('main/server_status.html',
         server_time=server_time,
-        server_info=server_info,
-        service_info=service_info,
-        ftp_service_info=ftp_service_info,
-        resource_info=resource_info,
-        backup_storage=backup_storage
+        **cached[0]
     )
 
 
@@ -705,7 +883,6 @@ def server_status():
 def ftp_settings():
     """FTP Settings page for ZTE OLT backup ingestion"""
     import os
-    import subprocess
     
     # Get FTP service status from systemd
     ftp_status = {
@@ -716,23 +893,10 @@ def ftp_settings():
         'root': os.environ.get('LEUITCSS_FTP_ROOT', '/var/lib/leuitcss/ftp-ingestion')
     }
     
-    try:
-        # Check if service is running
-        result = subprocess.run(
-            ['systemctl', 'is-active', 'leuitcss-ftp'],
-            capture_output=True, text=True, timeout=5
-        )
-        ftp_status['running'] = result.stdout.strip() == 'active'
-        ftp_status['enabled'] = ftp_status['running']
-        
-        # Check if service is enabled (auto-start)
-        result2 = subprocess.run(
-            ['systemctl', 'is-enabled', 'leuitcss-ftp'],
-            capture_output=True, text=True, timeout=5
-        )
-        # enabled at boot vs currently running are different
-    except:
-        pass
+    # Check if service is running
+    ftp_unit = _systemd_show(('leuitcss-ftp',), ('ActiveState',)).get('leuitcss-ftp', {})
+    ftp_status['running'] = ftp_unit.get('ActiveState') == 'active'
+    ftp_status['enabled'] = ftp_status['running']
     
     ftp_username = os.environ.get('LEUITCSS_FTP_USER', 'leuitcss')
     
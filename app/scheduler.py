@@ -13,6 +13,7 @@ ACTIVE MODE: Scheduler truly executes backup operations
 """
 
 import logging
+import threading
 from datetime import datetime, timedelta
 from typing import Optional, List
 
@@ -20,10 +21,12 @@ from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
+from sqlalchemy import update
+from sqlalchemy.orm import undefer_group
 
 from config import get_config
 from app.models import Device, BackupSchedule
-from app.collector import get_collector
+from app.collector import BackupCollector
 from app.audit import get_audit_logger
 
 # Configure logging
@@ -69,6 +72,10 @@ class BackupSchedulerService:
         
         self._started = False
         
+        # Devices with a queued (manual) backup, from queue_backup() until the job ends
+        self._running_devices = set()
+        self._running_lock = threading.Lock()
+        
         if app:
             self.init_app(app)
     
@@ -114,13 +121,19 @@ class BackupSchedulerService:
         else:
             raise ValueError(f"Unsupported frequency: {schedule.frequency}")
     
-    def _execute_backup(self, device_id: int, schedule_id: int):
+    def _get_queued_job_id(self, device_id: int) -> str:
+        """Generate job ID for a queued one-off device backup"""
+        return f"backup_device_{device_id}"
+    
+    def _execute_backup(self, device_id: int, schedule_id: Optional[int] = None,
+                        triggered_by: str = 'scheduler'):
         """
         Execute backup for a device (called by scheduler).
         
-        This runs in a separate thread from APScheduler.
+        This runs in a separate thread from APScheduler. schedule_id is
+        None for backups queued with queue_backup().
         """
-        logger.info(f"Scheduler executing backup for device {device_id} (schedule {schedule_id})")
+        logger.info(f"Scheduler executing backup for device {device_id} (schedule {schedule_id}, {triggered_by})")
         
         if not self.db_session_factory:
             logger.error("Database session factory not set")
@@ -130,8 +143,10 @@ class BackupSchedulerService:
         db_session = self.db_session_factory()
         
         try:
-            # Get device
-            device = db_session.query(Device).filter(Device.id == device_id).first()
+            # Get device (with credentials, needed for the backup)
+            device = db_session.get(Device, device_id, options=[
+                undefer_group('credentials')
+            ])
             
             if not device:
                 logger.error(f"Device {device_id} not found")
@@ -141,15 +156,18 @@ class BackupSchedulerService:
                 logger.info(f"Device {device_id} is inactive, skipping backup")
                 return
             
-            # Execute backup
-            collector = get_collector(db_session)
-            result = collector.backup_device(device, triggered_by='scheduler')
+            # Private collector: the get_collector() singleton's session is shared across threads
+            collector = BackupCollector(db_session)
+            result = collector.backup_device(device, triggered_by=triggered_by)
             
             if result['success']:
                 logger.info(f"Backup successful for device {device.name}: {result['file_path']}")
             else:
                 logger.error(f"Backup failed for device {device.name}: {result['error']}")
             
+            if schedule_id is None:
+                return
+            
             # Update schedule last_run
             schedule = db_session.query(BackupSchedule).filter(
                 BackupSchedule.id == schedule_id
@@ -170,17 +188,19 @@ class BackupSchedulerService:
         finally:
             db_session.close()
     
-    def add_schedule(self, schedule: BackupSchedule, device: Device):
+    def _add_job(self, schedule: BackupSchedule, device: Device):
         """
-        Add a backup schedule to the scheduler.
+        Register the APScheduler job for a schedule.
         
-        Args:
-            schedule: BackupSchedule model instance
-            device: Device model instance
+        Only device.id and device.name are used, so a (id, name, ...)
+        row works as well as a Device instance.
+        
+        Returns:
+            The job, or None if the schedule is inactive or invalid
         """
         if not schedule.is_active:
             logger.info(f"Schedule {schedule.id} is inactive, not adding to scheduler")
-            return
+            return None
         
         job_id = self._get_job_id(schedule.id)
         
@@ -190,7 +210,7 @@ class BackupSchedulerService:
         try:
             trigger = self._build_cron_trigger(schedule)
             
-            self.scheduler.add_job(
+            job = self.scheduler.add_job(
                 func=self._execute_backup,
                 trigger=trigger,
                 id=job_id,
@@ -200,23 +220,65 @@ class BackupSchedulerService:
             )
             
             logger.info(f"Added schedule {schedule.id} for device {device.name}")
+            return job
             
-            # Update next_run in schedule
-            job = self.scheduler.get_job(job_id)
-            if job and self.db_session_factory:
-                db_session = self.db_session_factory()
-                try:
-                    db_schedule = db_session.query(BackupSchedule).filter(
-                        BackupSchedule.id == schedule.id
-                    ).first()
-                    if db_schedule:
-                        db_schedule.next_run = job.next_run_time
-                        db_session.commit()
-                finally:
-                    db_session.close()
-                    
         except Exception as e:
             logger.error(f"Failed to add schedule {schedule.id}: {e}")
+            return None
+    
+    def _store_next_runs(self, jobs: dict):
+        """
+        Write next_run for several schedules in one transaction.
+        
+        Args:
+            jobs: Mapping of schedule id -> APScheduler job
+        """
+        if not jobs or not self.db_session_factory:
+            return
+        
+        # Before the scheduler starts, next_run_time is not computed yet
+        rows = [
+            {'id': schedule_id, 'next_run': job.next_run_time}
+            for schedule_id, job in jobs.items()
+            if hasattr(job, 'next_run_time')
+        ]
+        if not rows:
+            return
+        
+        db_session = self.db_session_factory()
+        try:
+            # Bulk UPDATE by primary key (executemany), single commit
+            db_session.execute(update(BackupSchedule), rows)
+            db_session.commit()
+        except Exception as e:
+            db_session.rollback()
+            logger.error(f"Failed to store next run for schedules {list(jobs)}: {e}")
+        finally:
+            db_session.close()
+    
+    def add_schedule(self, schedule: BackupSchedule, device: Device):
+        """
+        Add a backup schedule to the scheduler.
+        
+        Args:
+            schedule: BackupSchedule model instance
+            device: Device model instance
+        """
+        self.update_schedules([schedule], device)
+    
+    def update_schedules(self, schedules: List[BackupSchedule], device: Device):
+        """
+        Add or replace the jobs for several schedules of one device.
+        
+        next_run of all of them is written back in a single transaction.
+        """
+        jobs = {}
+        for schedule in schedules:
+            job = self._add_job(schedule, device)
+            if job is not None:
+                jobs[schedule.id] = job
+        
+        self._store_next_runs(jobs)
     
     def remove_schedule(self, schedule_id: int):
         """Remove a schedule from the scheduler"""
@@ -243,16 +305,22 @@ class BackupSchedulerService:
         try:
             schedules = db_session.query(BackupSchedule).filter(
                 BackupSchedule.is_active == True
-            ).all()
+            ).order_by(BackupSchedule.next_run).all()
             
+            devices = {
+                device.id: device
+                for device in db_session.query(Device).filter(Device.is_active == True).all()
+            }
+            
+            jobs = {}
             for schedule in schedules:
-                device = db_session.query(Device).filter(
-                    Device.id == schedule.device_id,
-                    Device.is_active == True
-                ).first()
-                
+                device = devices.get(schedule.device_id)
                 if device:
-                    self.add_schedule(schedule, device)
+                    job = self._add_job(schedule, device)
+                    if job is not None:
+                        jobs[schedule.id] = job
+            
+            self._store_next_runs(jobs)
             
             logger.info(f"Loaded {len(schedules)} schedules")
             
@@ -276,6 +344,58 @@ class BackupSchedulerService:
             self._started = False
             logger.info("Backup scheduler stopped")
     
+    def _execute_queued_backup(self, device_id: int, triggered_by: str):
+        """Run a queued backup; the device stays pending (see queue_backup) until it ends"""
+        try:
+            self._execute_backup(device_id, None, triggered_by)
+        finally:
+            with self._running_lock:
+                self._running_devices.discard(device_id)
+    
+    def queue_backup(self, device_id: int, triggered_by: str = 'manual') -> bool:
+        """
+        Queue a one-off backup on the scheduler's worker pool.
+        
+        The backup runs with its own database session, so the caller
+        (e.g. a web request) can return immediately.
+        
+        Returns:
+            False if a backup for this device is already queued or running
+        
+        Raises:
+            RuntimeError: If the scheduler is not running
+        """
+        if not self._started:
+            raise RuntimeError("Backup scheduler is not running")
+        
+        # Marked pending before the job exists, so there is no window between
+        # the job leaving the jobstore and starting in which a duplicate can be queued
+        with self._running_lock:
+            if device_id in self._running_devices:
+                return False
+            self._running_devices.add(device_id)
+        
+        try:
+            self.scheduler.add_job(
+                func=self._execute_queued_backup,
+                args=[device_id, triggered_by],
+                id=self._get_queued_job_id(device_id),
+                name=f"Backup device {device_id} ({triggered_by})",
+                misfire_grace_time=None  # Always run: only the job's finally clears pending
+            )
+        except Exception:
+            with self._running_lock:
+                self._running_devices.discard(device_id)
+            raise
+        
+        logger.info(f"Queued {triggered_by} backup for device {device_id}")
+        return True
+    
+    def is_backup_pending(self, device_id: int) -> bool:
+        """Check whether a queued backup for the device is waiting or running"""
+        with self._running_lock:
+            return device_id in self._running_devices
+    
     def get_jobs(self) -> List[dict]:
         """Get list of scheduled jobs"""
         jobs = []
@@ -11,10 +11,12 @@ Storage Rules:
 
 import os
 import json
+import mmap
+import shutil
 import hashlib
 from pathlib import Path
 from datetime import datetime
-from typing import Optional, Dict, List
+from typing import Optional, Dict, List, Union, Callable
 
 from config import get_config
 
@@ -38,6 +40,8 @@ class StorageManager:
     - Every backup creates new timestamped directory
     """
     
+    STREAM_CHUNK_SIZE = 64 * 1024
+    
     def __init__(self, base_path: str = None):
         self.config = get_config()
         self.base_path = Path(base_path or self.config.STORAGE_PATH)
@@ -91,7 +95,7 @@ class StorageManager:
     
     def save_backup(self, vendor: str, device_id: int, device_name: str,
                    device_ip: str, connection_type: str, backup_command: str,
-                   config_output: str, output_extension: str,
+                   config_output: Union[str, bytes], output_extension: str,
                    execution_time: float, timestamp: datetime = None) -> Dict:
         """
         Save backup to immutable storage.
@@ -103,7 +107,7 @@ class StorageManager:
             device_ip: Device IP address
             connection_type: Connection type used (ssh/telnet)
             backup_command: Backup command executed
-            config_output: Configuration output string
+            config_output: Configuration output (str, or bytes stored as-is)
             output_extension: File extension (.rsc, .txt, etc.)
             execution_time: Backup execution time in seconds
             timestamp: Backup timestamp (defaults to now)
@@ -117,6 +121,59 @@ class StorageManager:
                 - checksum: SHA256 checksum
                 - error: error message if failed
         """
+        def write_config(config_path: Path) -> tuple:
+            # Binary output (e.g. ZTE startrun.dat) is stored untouched
+            if isinstance(config_output, bytes):
+                data = config_output
+            else:
+                data = config_output.encode('utf-8')
+            
+            with open(config_path, 'xb') as f:
+                f.write(data)
+            return hashlib.sha256(data).hexdigest(), len(data)
+        
+        return self._store_backup(vendor, device_id, device_ip, connection_type,
+                                  backup_command, output_extension, execution_time,
+                                  timestamp, write_config)
+    
+    def save_backup_stream(self, vendor: str, device_id: int, device_ip: str,
+                          connection_type: str, backup_command: str,
+                          src_path: str, output_extension: str,
+                          execution_time: float, timestamp: datetime = None) -> Dict:
+        """
+        Save backup to immutable storage by streaming an existing file.
+        
+        The source is copied in-kernel (see _copy_and_hash), so memory use
+        does not grow with the config size. Bytes are stored as received.
+        
+        Args:
+            vendor: Vendor name
+            device_id: Device database ID
+            device_ip: Device IP address
+            connection_type: How the file was obtained (e.g. ftp)
+            backup_command: Backup command executed
+            src_path: Path of the file to store
+            output_extension: File extension (.dat, .txt, etc.)
+            execution_time: Backup execution time in seconds
+            timestamp: Backup timestamp (defaults to now)
+        
+        Returns:
+            Dict with save result (same keys as save_backup)
+        """
+        return self._store_backup(vendor, device_id, device_ip, connection_type,
+                                  backup_command, output_extension, execution_time,
+                                  timestamp, lambda config_path: self._copy_and_hash(src_path, config_path))
+    
+    def _store_backup(self, vendor: str, device_id: int, device_ip: str,
+                     connection_type: str, backup_command: str, output_extension: str,
+                     execution_time: float, timestamp: Optional[datetime],
+                     write_config: Callable[[Path], tuple]) -> Dict:
+        """
+        Create the backup directory with config, metadata and checksum files.
+        
+        write_config(config_path) creates the config file and returns
+        (sha256 hexdigest, size); everything else is shared by all writers.
+        """
         result = {
             'success': False,
             'file_path': None,
@@ -126,6 +183,7 @@ class StorageManager:
             'error': None
         }
         
+        backup_dir = None
         try:
             timestamp = timestamp or datetime.utcnow()
             backup_dir = self._get_backup_path(vendor, device_id, timestamp)
@@ -133,9 +191,6 @@ class StorageManager:
             # Create directory (will fail if exists - immutable)
             backup_dir.mkdir(parents=True, exist_ok=False)
             
-            # Calculate checksum
-            checksum = hashlib.sha256(config_output.encode()).hexdigest()
-            
             # Determine file names
             config_filename = f"config{output_extension}"
             metadata_filename = "metadata.json"
@@ -143,8 +198,7 @@ class StorageManager:
             
             # Save config file
             config_path = backup_dir / config_filename
-            with open(config_path, 'w', encoding='utf-8') as f:
-                f.write(config_output)
+            checksum, file_size = write_config(config_path)
             
             # Create and save metadata
             metadata = self._create_metadata(
@@ -182,15 +236,57 @@ class StorageManager:
             result['metadata_path'] = str(relative_dir / metadata_filename)
             result['checksum_path'] = str(relative_dir / checksum_filename)
             result['checksum'] = checksum
-            result['file_size'] = len(config_output.encode())
+            result['file_size'] = file_size
             
         except FileExistsError:
             result['error'] = "Backup directory already exists (immutability violation)"
         except Exception as e:
             result['error'] = str(e)
+            # Directory was created by this call: drop the partial backup
+            if backup_dir is not None and backup_dir.exists():
+                shutil.rmtree(backup_dir, ignore_errors=True)
         
         return result
     
+    def _copy_and_hash(self, src_path, dst_path) -> tuple:
+        """
+        Copy src to a new dst file and return (sha256 hexdigest, size).
+        
+        Raises OSError if fewer than size bytes reach dst.
+        
+        The hash is taken from an mmap of the source (page cache, no bytes
+        copy) and the copy is done in-kernel with os.sendfile. Falls back to
+        a chunked read/write loop where sendfile is unavailable.
+        """
+        with open(src_path, 'rb') as src, open(dst_path, 'xb') as dst:
+            size = os.fstat(src.fileno()).st_size
+            
+            if not hasattr(os, 'sendfile'):
+                hasher = hashlib.sha256()
+                for chunk in iter(lambda: src.read(self.STREAM_CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+                    dst.write(chunk)
+                return hasher.hexdigest(), size
+            
+            if size == 0:
+                return hashlib.sha256().hexdigest(), 0
+            
+            with mmap.mmap(src.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                checksum = hashlib.sha256(mapped).hexdigest()
+            
+            offset = 0
+            while offset < size:
+                sent = os.sendfile(dst.fileno(), src.fileno(), offset, size - offset)
+                if sent == 0:
+                    break
+                offset += sent
+            
+            # Source shrank or sendfile stopped early: never store a truncated copy
+            if offset != size:
+                raise OSError(f"Short copy: {offset} of {size} bytes written to {dst_path}")
+            
+            return checksum, size
+    
     def get_backup(self, file_path: str) -> Optional[str]:
         """
         Retrieve backup content by relative path.
@@ -248,9 +344,15 @@ class StorageManager:
         with open(checksum_path, 'r') as f:
             stored_checksum = f.read().split()[0]
         
-        # Calculate current checksum
+        # Calculate current checksum (streamed, never the whole file in memory)
         with open(full_path, 'rb') as f:
-            current_checksum = hashlib.sha256(f.read()).hexdigest()
+            if hasattr(hashlib, 'file_digest'):
+                current_checksum = hashlib.file_digest(f, 'sha256').hexdigest()
+            else:
+                hasher = hashlib.sha256()
+                for chunk in iter(lambda: f.read(self.STREAM_CHUNK_SIZE), b''):
+                    hasher.update(chunk)
+                current_checksum = hasher.hexdigest()
         
         return stored_checksum == current_checksum
     
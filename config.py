@@ -40,22 +40,47 @@ class Config:
     # Storage Configuration
     STORAGE_PATH = os.environ.get('LEUITCSS_STORAGE_PATH', str(BASE_DIR / 'storage'))
     
+    # Backup downloads handed off to a front-end web server (sendfile in the server, not Python).
+    # USE_X_SENDFILE: Apache mod_xsendfile / lighttpd (Flask's send_file sets X-Sendfile).
+    # X_ACCEL_REDIRECT_PREFIX: nginx internal location mapped to STORAGE_PATH, e.g. /internal-backups
+    USE_X_SENDFILE = os.environ.get('LEUITCSS_USE_X_SENDFILE', '').lower() in ('1', 'true', 'yes')
+    X_ACCEL_REDIRECT_PREFIX = os.environ.get('LEUITCSS_X_ACCEL_REDIRECT_PREFIX', '').rstrip('/') or None
+    
     # Log Configuration
     LOG_PATH = os.environ.get('LEUITCSS_LOG_PATH', str(BASE_DIR / 'logs'))
     AUDIT_LOG_FILE = 'audit.log'
+    AUDIT_BATCH_SIZE = 64  # Audit DB entries written per transaction
+    AUDIT_FLUSH_INTERVAL = 5  # Max seconds an audit entry waits before DB write
+    # Actions written to the audit file only, not the DB (comma-separated, empty = log all)
+    AUDIT_DB_EXCLUDE = frozenset(
+        a.strip() for a in os.environ.get('LEUITCSS_AUDIT_DB_EXCLUDE', 'backup_start').split(',') if a.strip()
+    )
     APP_LOG_FILE = 'leuitcss.log'
     
     # Session Configuration
     PERMANENT_SESSION_LIFETIME = timedelta(hours=8)
     
+    # Password hashing cost (bcrypt log rounds, minimum 10).
+    # Values below 12 should be paired with compensating controls such as MFA.
+    BCRYPT_ROUNDS = max(10, int(os.environ.get('LEUITCSS_BCRYPT_ROUNDS', 12)))
+    
+    # Login verification cache (seconds a bcrypt result is reused, 0 disables)
+    PASSWORD_VERIFY_CACHE_TTL = int(os.environ.get('LEUITCSS_PASSWORD_VERIFY_CACHE_TTL', 5))
+    
     # Connection Timeouts (in seconds)
     SSH_TIMEOUT = 30
     TELNET_TIMEOUT = 30
     COMMAND_TIMEOUT = 60
     
+    # Connection Pool (idle SSH/Telnet sessions kept for reuse, in seconds)
+    CONNECTION_POOL_IDLE_TIMEOUT = int(os.environ.get('LEUITCSS_CONNECTION_POOL_IDLE_TIMEOUT', 300))
+    
     # Retry Configuration
     MAX_RETRY = 1  # Maksimal 1 kali retry, tidak looping
     
+    # Concurrency Configuration
+    BACKUP_CONCURRENCY = int(os.environ.get('LEUITCSS_BACKUP_CONCURRENCY', 32))  # Max parallel device sessions
+    
     # Default Ports
     DEFAULT_SSH_PORT = 22
     DEFAULT_TELNET_PORT = 23
@@ -160,7 +185,20 @@ config = {
     'default': DevelopmentConfig
 }
 
+# Singleton instance (environment is read once per process)
+_config_instance = None
+
 def get_config():
     """Get configuration based on environment"""
-    env = os.environ.get('LEUITCSS_ENV', 'development')
-    return config.get(env, config['default'])()
+    global _config_instance
+    if _config_instance is None:
+        env = os.environ.get('LEUITCSS_ENV', 'development')
+        _config_instance = config.get(env, config['default'])()
+    return _config_instance
+
+
+def reload_config():
+    """Drop the cached configuration so the next get_config() re-reads LEUITCSS_ENV"""
+    global _config_instance
+    _config_instance = None
+    return get_config()
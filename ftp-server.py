@@ -24,7 +24,7 @@ load_dotenv('/etc/leuitcss/leuitcss.env')
 try:
     from pyftpdlib.authorizers import DummyAuthorizer
     from pyftpdlib.handlers import FTPHandler
-    from pyftpdlib.servers import FTPServer
+    from pyftpdlib.servers import ThreadedFTPServer
 except ImportError:
     print("ERROR: pyftpdlib not installed. Run: pip install pyftpdlib")
     sys.exit(1)
@@ -35,6 +35,9 @@ FTP_USER = os.environ.get('LEUITCSS_FTP_USER', 'leuitcss')
 FTP_PASSWORD = os.environ.get('LEUITCSS_FTP_PASSWORD', '')
 FTP_ROOT = os.environ.get('LEUITCSS_FTP_ROOT', '/var/lib/leuitcss/ftp-ingestion')
 
+# Passive data ports (pyftpdlib copies this into a list per PASV and picks randomly)
+PASSIVE_PORTS = tuple(range(60000, 60100))
+
 # Setup logging
 logging.basicConfig(
     level=logging.INFO,
@@ -128,12 +131,13 @@ def main():
     # Create handler
     handler = LeuitFTPHandler
     handler.authorizer = authorizer
-    handler.passive_ports = range(60000, 60100)
+    handler.passive_ports = PASSIVE_PORTS
     handler.banner = "LeuitCSS FTP Ingestion Server - ZTE OLT Only"
     
     # Create and start server
-    server = FTPServer(('0.0.0.0', FTP_PORT), handler)
-    server.max_cons = 10
+    # One thread per connection, so a slow OLT upload doesn't stall the others
+    server = ThreadedFTPServer(('0.0.0.0', FTP_PORT), handler)
+    server.max_cons = 50
     server.max_cons_per_ip = 3
     
     # Signal handlers for graceful shutdown
@@ -24,11 +24,11 @@ from pathlib import Path
 PROJECT_ROOT = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, PROJECT_ROOT)
 
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, func
 from sqlalchemy.orm import sessionmaker
 
 from config import get_config
-from app.models import Base, Admin, Device, BackupSchedule, BackupHistory
+from app.models import Base, configure_sqlite, Admin, Device, BackupSchedule, BackupHistory
 from app.auth import AuthService
 
 
@@ -58,6 +58,7 @@ def get_db_session():
         config.SQLALCHEMY_DATABASE_URI,
         connect_args={'check_same_thread': False}
     )
+    configure_sqlite(engine)
     Base.metadata.create_all(engine)
     Session = sessionmaker(bind=engine)
     return Session()
@@ -196,10 +197,10 @@ def cmd_status(args):
     try:
         session = get_db_session()
         
-        admin_count = session.query(Admin).count()
-        device_count = session.query(Device).count()
-        schedule_count = session.query(BackupSchedule).count()
-        backup_count = session.query(BackupHistory).count()
+        admin_count = session.query(func.count(Admin.id)).scalar()
+        device_count = session.query(func.count(Device.id)).scalar()
+        schedule_count = session.query(func.count(BackupSchedule.id)).scalar()
+        backup_count = session.query(func.count(BackupHistory.id)).scalar()
         
         print(f"Database: [OK]")
         print(f"  - Admins: {admin_count}")
@@ -32,7 +32,8 @@ from sqlalchemy.orm import sessionmaker, scoped_session
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from config import get_config
-from app.models import Base
+from app.models import Base, configure_sqlite, create_indexes
+from app.audit import get_audit_logger
 
 # Configure logging
 logging.basicConfig(
@@ -69,7 +70,9 @@ def create_app(config_class=None):
         config.SQLALCHEMY_DATABASE_URI,
         connect_args={'check_same_thread': False}  # SQLite specific
     )
+    configure_sqlite(engine)  # WAL + busy_timeout
     Base.metadata.create_all(engine)
+    create_indexes(engine)  # indexes added after the tables were created
     
     # Create scoped session factory
     session_factory = sessionmaker(bind=engine)
@@ -101,8 +104,15 @@ def create_app(config_class=None):
     application.register_blueprint(main_bp)
     application.register_blueprint(backup_bp)
     
-    # Initialize audit logger
-    from app.audit import get_audit_logger
+    # Derive the credential key now rather than on the first request that needs it
+    # (the derived key is also cached on disk, so other workers load it instead)
+    from app.encryption import get_encryption
+    try:
+        get_encryption()
+    except EnvironmentError as e:
+        logger.warning(f"Credential encryption unavailable: {e}")
+    
+    # Initialize audit logger (its teardown runs before remove_session, registered above)
     audit = get_audit_logger()
     audit.init_app(application)
     
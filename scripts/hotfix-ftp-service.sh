@@ -62,7 +62,7 @@ except:
 try:
     from pyftpdlib.authorizers import DummyAuthorizer
     from pyftpdlib.handlers import FTPHandler
-    from pyftpdlib.servers import FTPServer
+    from pyftpdlib.servers import ThreadedFTPServer
 except ImportError:
     print("ERROR: pyftpdlib not installed")
     sys.exit(1)
@@ -72,6 +72,9 @@ FTP_USER = os.environ.get('LEUITCSS_FTP_USER', 'leuitcss')
 FTP_PASSWORD = os.environ.get('LEUITCSS_FTP_PASSWORD', '')
 FTP_ROOT = os.environ.get('LEUITCSS_FTP_ROOT', '/var/lib/leuitcss/ftp-ingestion')
 
+# Passive data ports (pyftpdlib copies this into a list per PASV and picks randomly)
+PASSIVE_PORTS = tuple(range(60000, 60100))
+
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -139,11 +142,12 @@ def main():
     
     handler = LeuitFTPHandler
     handler.authorizer = authorizer
-    handler.passive_ports = range(60000, 60100)
+    handler.passive_ports = PASSIVE_PORTS
     handler.banner = "LeuitCSS FTP Ingestion Server - ZTE OLT Only"
     
-    server = FTPServer(('0.0.0.0', FTP_PORT), handler)
-    server.max_cons = 10
+    # One thread per connection, so a slow OLT upload doesn't stall the others
+    server = ThreadedFTPServer(('0.0.0.0', FTP_PORT), handler)
+    server.max_cons = 50
     server.max_cons_per_ip = 3
     
     def signal_handler(signum, frame):